@@ -0,0 +1,88 @@
+# coding=utf-8
+# Benchmark/kiểm thử thủ công chế độ theo dõi log lệnh: một file log lớn được ghi thêm dần,
+# đo thời gian mỗi lần poll và bộ nhớ tăng thêm.
+# Chạy: python benchmarks/bench_command_log.py [MB_log_có_sẵn]
+# Hoặc theo dõi một file thật: python benchmarks/bench_command_log.py --follow đường_dẫn
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helper.catalog import load_catalogs
+from helper.command_log import CommandLogFollower
+from helper.config_store import DEFAULT_CONFIG
+from helper.viewmodel import OverlayModel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMANDS = ["L", "_LINE", "C", "_.MOVE", "'ZOOM", "Lệnh: TR", "CO", "REGEN"]
+
+
+def log_lines(count):
+    for i in range(count):
+        command = COMMANDS[i % len(COMMANDS)]
+        if command.startswith("Lệnh"):
+            yield f"{command}\n"
+        else:
+            yield f"Command: {command}\nSpecify first point:\n"
+
+
+def follow(path, model):
+    # Theo dõi file thật (ví dụ file log mà một script khác đang ghi thêm)
+    follower = CommandLogFollower(path)
+    follower.poll()
+    print(f"Đang theo dõi {path} (Ctrl+C để dừng)")
+    while True:
+        for command in follower.poll():
+            if model.follow_command(command) or command in model.command_index:
+                print(f"{command:>10} -> trang {model.pages.page + 1}: {model.rows()[0]}")
+        time.sleep(0.25)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = load_catalogs([os.path.join(ROOT, "catalogs", "default.json")], os.path.join(directory, "cache"))
+        model = OverlayModel(dict(DEFAULT_CONFIG), catalog)
+        if sys.argv[1:2] == ["--follow"]:
+            try:
+                follow(sys.argv[2], model)
+            except KeyboardInterrupt:
+                return 0
+        history_mb = int(sys.argv[1]) if sys.argv[1:] else 300
+        path = os.path.join(directory, "acad.log")
+        with open(path, 'wb') as f:
+            # Lịch sử lớn có sẵn (sparse) không bao giờ được đọc lại
+            f.truncate(history_mb * 1024 * 1024)
+            f.seek(0, os.SEEK_END)
+            f.write(b"\n")
+        follower = CommandLogFollower(path)
+        follower.poll()
+        tracemalloc.start()
+        polls, seen, slowest, followed = 0, 0, 0.0, 0
+        start = time.perf_counter()
+        for batch in range(2000):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.writelines(log_lines(5))
+            # Ép mtime khác nhau trên hệ thống tệp có độ phân giải thấp
+            os.utime(path, ns=(batch, batch))
+            began = time.perf_counter()
+            commands = follower.poll()
+            for command in commands:
+                followed += model.follow_command(command)
+            slowest = max(slowest, time.perf_counter() - began)
+            polls += 1
+            seen += len(commands)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        catalog.close()
+        print(f"log có sẵn {history_mb} MB, {polls} lần poll, {seen} lệnh nhận ra, {followed} lần đổi trang")
+        print(f"poll tb {elapsed / polls * 1e6:.1f} µs, chậm nhất {slowest * 1e3:.3f} ms, "
+              f"bộ nhớ đỉnh {peak / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
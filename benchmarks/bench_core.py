@@ -0,0 +1,86 @@
+# coding=utf-8
+# Benchmark phần lõi không cần màn hình: khởi động, lật trang, tìm kiếm, lưu cấu hình.
+# Chạy: python benchmarks/bench_core.py [kích_thước ...]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SIZES, write_catalog
+from helper.catalog import load_catalogs
+from helper.config_store import DEFAULT_CONFIG, ConfigStore
+from helper.viewmodel import OverlayModel
+
+QUERY = "duong thang"
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def bench_startup(source, cache_dir):
+    catalog, cold = timed(lambda: load_catalogs([source], cache_dir))
+    catalog.close()
+
+    def warm_start():
+        catalog = load_catalogs([source], cache_dir)
+        model = OverlayModel(dict(DEFAULT_CONFIG), catalog)
+        model.rows()
+        return model
+
+    model, warm = timed(warm_start)
+    return model, cold, warm
+
+
+def bench_flips(model, seconds=0.5):
+    flips = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        if not model.move(1):
+            model.pages.goto_page(0)
+        model.rows()
+        model.page_label()
+        flips += 1
+    return flips / (time.perf_counter() - start)
+
+
+def bench_search(model):
+    _, build = timed(lambda: model.build_search_index().join())
+    model.start_search()
+    latencies = []
+    for i in range(1, len(QUERY) + 1):
+        _, elapsed = timed(lambda: (model.set_query(QUERY[:i]), model.rows()))
+        latencies.append(elapsed)
+    model.stop_search()
+    return build, sum(latencies) / len(latencies), max(latencies)
+
+
+def bench_config(directory, count=200):
+    store = ConfigStore(os.path.join(directory, "config.json"))
+    _, elapsed = timed(lambda: [store.save() for _ in range(count)])
+    return count / elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or list(SIZES)
+    print(f"{'lệnh':>8} {'cold ms':>9} {'warm ms':>9} {'lật/giây':>10} "
+          f"{'index ms':>9} {'gõ ms (tb)':>11} {'gõ ms (max)':>12} {'lưu/giây':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            source = write_catalog(os.path.join(directory, f"catalog-{size}.json"), size)
+            model, cold, warm = bench_startup(source, os.path.join(directory, "cache"))
+            flips = bench_flips(model)
+            build, mean, worst = bench_search(model)
+            saves = bench_config(directory)
+            model.catalog.close()
+            print(f"{size:>8} {cold * 1000:>9.2f} {warm * 1000:>9.2f} {flips:>10.0f} "
+                  f"{build * 1000:>9.1f} {mean * 1000:>11.3f} {worst * 1000:>12.3f} {saves:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# coding=utf-8
+# So sánh bộ nhớ của các cách lưu catalog: chuỗi định dạng sẵn + danh sách trang (cách cũ),
+# tuple từng lệnh, đối tượng __slots__ từng lệnh và catalog cột trên mmap.
+# Chạy: python benchmarks/bench_memory.py [số_lệnh]
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import write_catalog
+from helper.catalog import CompiledCatalog, compile_catalog, format_entry, parse_catalog
+
+LINES_PER_PAGE = 5
+
+
+class SlottedEntry:
+    __slots__ = ("name", "alias", "description", "group", "tags")
+
+    def __init__(self, name, alias, description, group, tags):
+        self.name = name
+        self.alias = alias
+        self.description = description
+        self.group = group
+        self.tags = tags
+
+
+def legacy_layout(groups):
+    # Như main.py ban đầu: danh sách chuỗi hiển thị và danh sách các trang
+    commands = [format_entry(*fields[:3]) for _, commands in groups for fields in commands]
+    pages = [commands[i:i + LINES_PER_PAGE] for i in range(0, len(commands), LINES_PER_PAGE)]
+    return commands, pages
+
+
+def tuple_layout(groups):
+    return [(*fields[:3], group, fields[3]) for group, commands in groups for fields in commands]
+
+
+def slotted_layout(groups):
+    return [SlottedEntry(*fields[:3], group, fields[3]) for group, commands in groups for fields in commands]
+
+
+def measure(build):
+    # Bộ nhớ Python còn giữ sau khi dựng xong (KB) và thời gian dựng
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024, elapsed
+
+
+def page_time(render, count, pages=2000):
+    start = time.perf_counter()
+    for page in range(pages):
+        first = (page * 7919 * LINES_PER_PAGE) % max(1, count - LINES_PER_PAGE)
+        render(first)
+    return (time.perf_counter() - start) / pages * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if sys.argv[1:] else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        source = write_catalog(os.path.join(directory, "catalog.json"), count)
+        cache = os.path.join(directory, "catalog.bin")
+        compile_catalog(source, cache)
+        groups = parse_catalog(source)
+        # Chuỗi nguồn đã nằm trong bộ nhớ trước khi đo; mỗi cách chỉ tính phần dựng thêm
+        (commands, pages), legacy_kb, legacy_s = measure(lambda: legacy_layout(groups))
+        tuples, tuple_kb, tuple_s = measure(lambda: tuple_layout(groups))
+        slotted, slotted_kb, slotted_s = measure(lambda: slotted_layout(groups))
+        del groups
+        gc.collect()
+        catalog, mmap_kb, mmap_s = measure(lambda: CompiledCatalog(cache))
+
+        rows = [
+            ("chuỗi + trang (cũ)", legacy_kb, legacy_s,
+             page_time(lambda i: pages[i // LINES_PER_PAGE], count)),
+            ("tuple từng lệnh", tuple_kb, tuple_s,
+             page_time(lambda i: [format_entry(*t[:3]) for t in tuples[i:i + LINES_PER_PAGE]], count)),
+            ("đối tượng __slots__", slotted_kb, slotted_s,
+             page_time(lambda i: [format_entry(e.name, e.alias, e.description)
+                                  for e in slotted[i:i + LINES_PER_PAGE]], count)),
+            ("cột trên mmap", mmap_kb, mmap_s,
+             page_time(lambda i: catalog[i:i + LINES_PER_PAGE], count)),
+        ]
+        print(f"{count} lệnh, file cache {os.path.getsize(cache) / 1024:.0f} KB (mmap, dùng chung với page cache)")
+        print(f"{'cách lưu':<22} {'heap KB':>10} {'dựng ms':>9} {'trang µs':>9}")
+        for name, kb, seconds, micros in rows:
+            print(f"{name:<22} {kb:>10.0f} {seconds * 1000:>9.1f} {micros:>9.2f}")
+        catalog.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
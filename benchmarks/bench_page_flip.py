@@ -0,0 +1,75 @@
+# coding=utf-8
+# Đo số lần lật trang mỗi giây: cách cũ (xóa/tạo lại Label) so với bộ dòng tái sử dụng.
+# Chạy: python benchmarks/bench_page_flip.py [số_lần_lật] [số_dòng_mỗi_trang]
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helper.renderers import LabelRowRenderer
+from helper.themes import ThemeCompiler, create_fonts
+
+
+def make_pages(lines_per_page, page_count=200):
+    return [
+        [f"CMD{p}_{i} (C{i}) - Lệnh mẫu {p}.{i}" for i in range(lines_per_page)]
+        for p in range(page_count)
+    ]
+
+
+def legacy_render(frame, config, commands):
+    # Bản sao của update_commands trước khi có bộ dòng tái sử dụng
+    for widget in frame.winfo_children():
+        widget.destroy()
+    for cmd in commands:
+        label = ttk.Label(frame, text=cmd, style="Custom.TLabel")
+        label.pack(anchor=tk.W, pady=2)
+        if config["theme"] == "dark":
+            label.bind('<Enter>', lambda e, l=label: l.configure(foreground="#00FF00"))
+            label.bind('<Leave>', lambda e, l=label: l.configure(foreground=config["text_color"]))
+
+
+def run(name, root, render, pages, flips):
+    start = time.perf_counter()
+    for i in range(flips):
+        render(pages[i % len(pages)])
+        root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {flips / elapsed:10.1f} lần lật/giây ({elapsed * 1000 / flips:.3f} ms/lần)")
+
+
+def main():
+    flips = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    lines_per_page = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    config = {"theme": "dark", "text_color": "#FFFFFF", "font_size": 10, "lines_per_page": lines_per_page}
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Không mở được màn hình (dùng xvfb-run trên Linux): {e}")
+        return 1
+    style = ttk.Style()
+    style.configure("Custom.TFrame", background="#000000")
+    style.configure("Custom.TLabel", font=("Arial", 10), background="#000000", foreground="#FFFFFF")
+    create_fonts(root, config)
+    ThemeCompiler(style).compile(config)
+    pages = make_pages(lines_per_page)
+
+    legacy_frame = ttk.Frame(root, style="Custom.TFrame")
+    legacy_frame.pack(fill=tk.BOTH, expand=True)
+    run("trước", root, lambda cmds: legacy_render(legacy_frame, config, cmds), pages, flips)
+    legacy_frame.destroy()
+
+    pool_frame = ttk.Frame(root, style="Custom.TFrame")
+    pool_frame.pack(fill=tk.BOTH, expand=True)
+    rows = LabelRowRenderer(pool_frame, config)
+    run("sau", root, rows.render, pages, flips)
+
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
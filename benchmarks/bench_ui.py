@@ -0,0 +1,93 @@
+# coding=utf-8
+# Benchmark mức giao diện (Tk): lật trang thực sự vẽ lên cửa sổ.
+# Trên Linux không có màn hình sẽ tự chạy lại dưới xvfb-run nếu có.
+# Chạy: python benchmarks/bench_ui.py [kích_thước ...]
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SIZES, write_catalog
+from helper.catalog import load_catalogs
+from helper.config_store import DEFAULT_CONFIG
+from helper.viewmodel import OverlayModel
+
+
+def ensure_display():
+    # Trả về False nếu không thể có màn hình
+    if sys.platform != "linux" or os.environ.get("DISPLAY"):
+        return True
+    if os.environ.get("AUTOCAD_HELPER_XVFB"):
+        return False
+    xvfb_run = shutil.which("xvfb-run")
+    if xvfb_run is None:
+        return False
+    os.environ["AUTOCAD_HELPER_XVFB"] = "1"
+    os.execv(xvfb_run, [xvfb_run, "-a", sys.executable] + sys.argv)
+
+
+def bench_ui_flips(root, model, rows, seconds=1.0):
+    # Chỉ tính thời gian từ lúc lật tới lúc vẽ xong; vẽ trước trang kề nằm ngoài phép đo
+    flips = 0
+    painting = 0.0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if not model.move(1):
+            model.pages.goto_page(0)
+        rows.render(model.rows())
+        root.update_idletasks()
+        painting += time.perf_counter() - start
+        flips += 1
+        next_page = model.pages.page + 1
+        if next_page < model.pages.page_count:
+            rows.prepare(model.pages.rows(next_page))
+            root.update_idletasks()
+    return flips / painting
+
+
+def main():
+    if not ensure_display():
+        print("Không có màn hình và không tìm thấy xvfb-run, bỏ qua benchmark giao diện")
+        return 1
+    import tkinter as tk
+    from tkinter import ttk
+    from helper.renderers import make_row_renderer
+    from helper.themes import ThemeCompiler, create_fonts, style_name
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or list(SIZES)
+    root = tk.Tk()
+    create_fonts(root, DEFAULT_CONFIG)
+    theme_compiler = ThemeCompiler(ttk.Style())
+    print(f"{'lệnh':>8} {'kiểu':>7} {'đệm':>4} {'dòng':>5} {'tạo cửa sổ ms':>14} {'lật/giây':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            source = write_catalog(os.path.join(directory, f"catalog-{size}.json"), size)
+            catalog = load_catalogs([source], os.path.join(directory, "cache"))
+            for renderer, buffers in (("labels", 0), ("text", 0), ("labels", 3), ("text", 3)):
+                for lines_per_page in (10, 50):
+                    config = dict(DEFAULT_CONFIG, lines_per_page=lines_per_page,
+                                  renderer=renderer, page_buffers=buffers)
+                    model = OverlayModel(config, catalog)
+                    start = time.perf_counter()
+                    theme_compiler.compile(config)
+                    frame = ttk.Frame(root, style=style_name(config, "Custom.TFrame"))
+                    frame.pack(fill=tk.BOTH, expand=True)
+                    rows = make_row_renderer(frame, config)
+                    rows.render(model.rows())
+                    root.update()
+                    created = time.perf_counter() - start
+                    flips = bench_ui_flips(root, model, rows)
+                    print(f"{size:>8} {renderer:>7} {buffers:>4} {lines_per_page:>5} "
+                          f"{created * 1000:>14.2f} {flips:>10.0f}")
+                    frame.destroy()
+            catalog.close()
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
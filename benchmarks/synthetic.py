@@ -0,0 +1,28 @@
+# coding=utf-8
+# Sinh catalog lệnh giả lập cho benchmark
+import json
+import random
+
+WORDS = ["Vẽ", "đường", "thẳng", "tròn", "sao", "chép", "đối", "tượng", "kéo", "giãn",
+         "layer", "block", "dim", "văn", "bản", "góc", "cung", "lưới", "điểm", "xoay"]
+
+SIZES = (100, 10000, 100000)
+
+
+def make_entries(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        f"CMD{i} (C{i % 997}) - " + " ".join(rng.choice(WORDS) for _ in range(4))
+        for i in range(count)
+    ]
+
+
+def write_catalog(path, count, group_size=50, seed=0):
+    entries = make_entries(count, seed)
+    groups = [
+        {"name": f"Nhóm {g + 1}", "commands": entries[i:i + group_size]}
+        for g, i in enumerate(range(0, count, group_size))
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"name": f"Giả lập {count}", "groups": groups}, f, ensure_ascii=False)
+    return path
@@ -0,0 +1,2 @@
+# coding=utf-8
+# Các thành phần lõi của AutoCAD Helper, tách khỏi main.py
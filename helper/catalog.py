@@ -0,0 +1,452 @@
+# coding=utf-8
+import hashlib
+import itertools
+import mmap
+import os
+import re
+import struct
+import tempfile
+from array import array
+
+# Định dạng file cache (lưu theo cột, mỗi chuỗi chỉ lưu một lần):
+#   header
+#   | offsets chuỗi (uint32 x số chuỗi + 1)
+#   | tên, alias, mô tả của từng lệnh (3 cột uint32 x số lệnh, là id chuỗi)
+#   | vị trí bắt đầu tag của từng lệnh (uint32 x số lệnh + 1) | id chuỗi của các tag (uint32)
+#   | tên nhóm (uint32 x số nhóm) | nhóm của từng lệnh (uint16 x số lệnh) | UTF-8
+# Header có thêm SHA-1 của danh sách tên lệnh (dấu vân tay cho thống kê sử dụng)
+CACHE_MAGIC = b"ACHC"
+CACHE_VERSION = 4
+HEADER = struct.Struct("<4sHHdQ20sIIII20s")
+# Thứ tự các cột id chuỗi của lệnh
+COLUMNS = ("name", "alias", "description")
+
+# Dạng viết liền "LINE(L)-Vẽ": "-" phải đứng ngay sau ")" vì tên lệnh AutoCAD có thể chứa "-"
+# ("-LAYER (-LA)", "3D-ORBIT (3DO)")
+ENTRY_PATTERN = re.compile(r"^\s*([^()]*?)\s*\(([^()]*)\)\s*-\s*(.*?)\s*$")
+
+
+def format_entry(name, alias="", description=""):
+    # Chuỗi hiển thị dạng "LINE (L) - Vẽ đường thẳng"
+    text = name
+    if alias:
+        text += f" ({alias})"
+    if description:
+        text += f" - {description}"
+    return text
+
+
+def split_entry(text):
+    # Ngược lại với format_entry: trả về (tên, alias, mô tả)
+    head, separator, description = text.partition(" - ")
+    if not separator:
+        match = ENTRY_PATTERN.match(text)
+        if match:
+            return match.groups()
+    head = head.strip()
+    if head.endswith(")") and "(" in head:
+        name, _, alias = head[:-1].partition("(")
+        return name.strip(), alias.strip(), description.strip()
+    return head, "", description.strip()
+
+
+def split_tags(value):
+    # "2d; vẽ" hoặc ["2d", "vẽ"] -> ("2d", "vẽ")
+    if isinstance(value, str):
+        value = value.replace(",", ";").split(";")
+    elif value is not None and not (isinstance(value, list) and all(isinstance(tag, str) for tag in value)):
+        raise ValueError(f"tags không hợp lệ: {value!r}")
+    return tuple(tag.strip() for tag in value or () if tag.strip())
+
+
+def _text_field(item, key):
+    # Trường chuỗi của lệnh/nhóm trong JSON; thiếu hoặc null là chuỗi rỗng
+    value = item.get(key)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{key} không phải chuỗi: {value!r}")
+    return value
+
+
+def _entry_fields(item):
+    # Chuỗi "LINE (L) - Vẽ đường thẳng" hoặc {"name", "alias", "description", "tags"}
+    if isinstance(item, str):
+        return split_entry(item) + ((),)
+    if not isinstance(item, dict):
+        raise ValueError(f"lệnh không hợp lệ: {item!r}")
+    return (_text_field(item, "name"), _text_field(item, "alias"), _text_field(item, "description"),
+            split_tags(item.get("tags")))
+
+
+def parse_json_catalog(path):
+    # Hỗ trợ: danh sách lệnh, danh sách nhóm, hoặc {"groups": [...]}
+    # File sai cấu trúc báo ValueError để load_catalogs bỏ qua file đó
+    import json
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("groups", data.get("commands", []))
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: catalog phải là danh sách lệnh hoặc nhóm")
+    groups = []
+    loose = []
+    for item in data:
+        if isinstance(item, dict) and "commands" in item:
+            commands = item["commands"]
+            if not isinstance(commands, list):
+                raise ValueError(f"{path}: commands của nhóm phải là danh sách")
+            groups.append((_text_field(item, "name"), [_entry_fields(c) for c in commands]))
+        else:
+            loose.append(_entry_fields(item))
+    if loose:
+        groups.insert(0, ("", loose))
+    return groups
+
+
+def parse_csv_catalog(path):
+    # Cột: name, alias, description, group, tags (dòng đầu là tiêu đề)
+    import csv
+    groups = {}
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            name = (row.get("name") or "").strip()
+            if not name:
+                continue
+            fields = (name, (row.get("alias") or "").strip(), (row.get("description") or "").strip(),
+                      split_tags(row.get("tags") or ""))
+            groups.setdefault((row.get("group") or "").strip(), []).append(fields)
+    return list(groups.items())
+
+
+def parse_catalog(path):
+    if path.lower().endswith(".csv"):
+        return parse_csv_catalog(path)
+    return parse_json_catalog(path)
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def compile_catalog(source_path, cache_path, digest=None):
+    # Biên dịch catalog nguồn thành file cache nhị phân (ghi nguyên tử)
+    stat = os.stat(source_path)
+    if digest is None:
+        digest = _file_digest(source_path)
+    groups = parse_catalog(source_path)
+
+    # Gộp chuỗi trùng (mô tả, tag, tên nhóm lặp lại) thành một id; dict giữ thứ tự chèn
+    string_ids = {}
+
+    def intern(texts):
+        return array('I', [string_ids.setdefault(text, len(string_ids)) for text in texts])
+
+    entries = [fields for _, commands in groups for fields in commands]
+    group_ids = array('H', [gid for gid, (_, commands) in enumerate(groups) for _ in commands])
+    group_names = intern(name for name, _ in groups)
+    columns = [intern(fields[column] for fields in entries) for column in range(len(COLUMNS))]
+    tag_ids = intern(tag for fields in entries for tag in fields[3])
+    tag_starts = array('I', [0])
+    tag_starts.extend(itertools.accumulate(len(fields[3]) for fields in entries))
+    entry_count = len(entries)
+    names_digest = hashlib.sha1("\n".join(fields[0] for fields in entries).encode('utf-8')).digest()
+
+    encoded = [text.encode('utf-8') for text in string_ids]
+    blob = b"".join(encoded)
+    offsets = array('I', [0])
+    offsets.extend(itertools.accumulate(map(len, encoded)))
+
+    header = HEADER.pack(CACHE_MAGIC, CACHE_VERSION, 0, stat.st_mtime, stat.st_size,
+                         digest, entry_count, len(groups), len(offsets) - 1, len(tag_ids), names_digest)
+    directory = os.path.dirname(os.path.abspath(cache_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".catalog-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            for part in (offsets, *columns, tag_starts, tag_ids, group_names, group_ids):
+                part.tofile(f)
+            f.write(blob)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _read_header(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            raw = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(raw) != HEADER.size:
+        return None
+    header = HEADER.unpack(raw)
+    if header[0] != CACHE_MAGIC or header[1] != CACHE_VERSION:
+        return None
+    return header
+
+
+def _touch_header(cache_path, header, stat):
+    # Nội dung không đổi, chỉ cập nhật mtime/size để lần sau khỏi băm lại
+    header = HEADER.pack(header[0], header[1], header[2], stat.st_mtime, stat.st_size, *header[5:])
+    with open(cache_path, 'r+b') as f:
+        f.write(header)
+
+
+def cache_path_for(source_path, cache_dir):
+    source_path = os.path.abspath(source_path)
+    key = hashlib.sha1(source_path.encode('utf-8')).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(cache_dir, f"{name}-{key}.bin")
+
+
+def ensure_cache(source_path, cache_dir):
+    # Trả về đường dẫn cache hợp lệ, biên dịch lại nếu nguồn đã thay đổi
+    cache_path = cache_path_for(source_path, cache_dir)
+    stat = os.stat(source_path)
+    header = _read_header(cache_path)
+    if header is not None and header[3] == stat.st_mtime and header[4] == stat.st_size:
+        return cache_path
+    digest = _file_digest(source_path)
+    if header is not None and header[5] == digest:
+        _touch_header(cache_path, header, stat)
+        return cache_path
+    compile_catalog(source_path, cache_path, digest)
+    return cache_path
+
+
+class Entry:
+    """Một dòng của catalog; các trường chỉ được giải mã khi đọc tới."""
+
+    __slots__ = ("catalog", "index")
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+
+    @property
+    def name(self):
+        return self.catalog.name(self.index)
+
+    @property
+    def alias(self):
+        return self.catalog.alias(self.index)
+
+    @property
+    def description(self):
+        return self.catalog.description(self.index)
+
+    @property
+    def group(self):
+        return self.catalog.group_name(self.catalog.group_of(self.index))
+
+    @property
+    def tags(self):
+        return self.catalog.tags(self.index)
+
+    def __str__(self):
+        return self.catalog[self.index]
+
+    def __repr__(self):
+        return f"Entry({self.index}, {str(self)!r})"
+
+
+class CompiledCatalog:
+    """Catalog đọc trực tiếp từ file cache qua mmap, chỉ giải mã các dòng cần hiển thị."""
+
+    def __init__(self, cache_path):
+        self.path = cache_path
+        self._file = open(cache_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self._map, 0)
+        self.entry_count = header[6]
+        self.group_count = header[7]
+        string_count = header[8]
+        tag_count = header[9]
+        # Chỉ đổi khi tên/thứ tự lệnh đổi, sửa mô tả không làm mất thống kê
+        self.fingerprint = header[10]
+        # Các cột là memoryview trên mmap: không sao chép, không tạo đối tượng Python cho từng lệnh
+        view = memoryview(self._map)
+        self._views = [view]
+        position = HEADER.size
+
+        def column(count, code='I'):
+            nonlocal position
+            size = struct.calcsize(code) * count
+            part = view[position:position + size].cast(code)
+            self._views.append(part)
+            position += size
+            return part
+
+        self._offsets = column(string_count + 1)
+        self._names, self._aliases, self._descriptions = (column(self.entry_count) for _ in COLUMNS)
+        self._tag_starts = column(self.entry_count + 1)
+        self._tag_ids = column(tag_count)
+        self._group_names = column(self.group_count)
+        self._groups = column(self.entry_count, 'H')
+        self._blob_at = position
+
+    def __len__(self):
+        return self.entry_count
+
+    def _string(self, sid):
+        offsets = self._offsets
+        return self._map[self._blob_at + offsets[sid]:self._blob_at + offsets[sid + 1]].decode('utf-8')
+
+    def _check(self, index):
+        if index < 0:
+            index += self.entry_count
+        if not 0 <= index < self.entry_count:
+            raise IndexError(index)
+        return index
+
+    def name(self, index):
+        return self._string(self._names[index])
+
+    def alias(self, index):
+        return self._string(self._aliases[index])
+
+    def description(self, index):
+        return self._string(self._descriptions[index])
+
+    def tags(self, index):
+        return tuple(self._string(sid) for sid in self._tag_ids[self._tag_starts[index]:self._tag_starts[index + 1]])
+
+    def entry(self, index):
+        return Entry(self, self._check(index))
+
+    def _display(self, index):
+        # Chuỗi hiển thị chỉ được ghép cho các dòng đang xem
+        return format_entry(self.name(index), self.alias(index), self.description(index))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._display(i) for i in range(*index.indices(self.entry_count))]
+        return self._display(self._check(index))
+
+    def group_of(self, index):
+        return self._groups[index]
+
+    def group_name(self, group):
+        return self._string(self._group_names[group])
+
+    def close(self):
+        # Phải trả các memoryview trước khi đóng mmap
+        for part in reversed(self._views):
+            part.release()
+        self._views = []
+        self._map.close()
+        self._file.close()
+
+
+class ChainedCatalog:
+    """Ghép nhiều catalog thành một dãy lệnh liên tục."""
+
+    def __init__(self, catalogs):
+        self.catalogs = list(catalogs)
+        self._starts = []
+        total = 0
+        for catalog in self.catalogs:
+            self._starts.append(total)
+            total += len(catalog)
+        self._length = total
+        self.fingerprint = hashlib.sha1(b"".join(catalog_fingerprint(c) for c in self.catalogs)).digest()
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def group_count(self):
+        return sum(catalog.group_count for catalog in self.catalogs)
+
+    def _locate(self, index):
+        for catalog, start in zip(reversed(self.catalogs), reversed(self._starts)):
+            if index >= start and len(catalog):
+                return catalog, index - start
+        raise IndexError(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        catalog, local = self._locate(index)
+        return catalog[local]
+
+    def name(self, index):
+        catalog, local = self._locate(index)
+        return catalog.name(local)
+
+    def alias(self, index):
+        catalog, local = self._locate(index)
+        return catalog.alias(local)
+
+    def description(self, index):
+        catalog, local = self._locate(index)
+        return catalog.description(local)
+
+    def tags(self, index):
+        catalog, local = self._locate(index)
+        return catalog.tags(local)
+
+    def group_of(self, index):
+        # Nhóm được đánh số liên tục qua các catalog
+        catalog, local = self._locate(index)
+        offset = 0
+        for other in self.catalogs:
+            if other is catalog:
+                break
+            offset += other.group_count
+        return offset + catalog.group_of(local)
+
+    def group_name(self, group):
+        for catalog in self.catalogs:
+            if group < catalog.group_count:
+                return catalog.group_name(group)
+            group -= catalog.group_count
+        raise IndexError(group)
+
+    def entry(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return Entry(self, index)
+
+    def close(self):
+        for catalog in self.catalogs:
+            catalog.close()
+
+
+def catalog_fingerprint(catalog):
+    # Thống kê sử dụng lưu theo chỉ số lệnh nên chỉ dùng lại được với đúng danh sách tên này
+    fingerprint = getattr(catalog, "fingerprint", None)
+    if fingerprint is not None:
+        return fingerprint
+    if hasattr(catalog, "name"):
+        names = (catalog.name(i) for i in range(len(catalog)))
+    else:
+        names = (str(item) for item in catalog)
+    return hashlib.sha1("\n".join(names).encode('utf-8')).digest()
+
+
+def load_catalogs(paths, cache_dir):
+    # Bỏ qua file nguồn lỗi/không tồn tại để overlay vẫn khởi động được
+    catalogs = []
+    for path in paths:
+        try:
+            catalogs.append(CompiledCatalog(ensure_cache(path, cache_dir)))
+        except (OSError, ValueError, KeyError, struct.error):
+            continue
+    return ChainedCatalog(catalogs)
@@ -0,0 +1,70 @@
+# coding=utf-8
+import os
+import re
+
+# Dòng lệnh trong file log của AutoCAD (LOGFILEON), ví dụ "Command: _LINE" hoặc "Lệnh: L".
+# Bỏ các tiền tố _ . ' + mà AutoCAD thêm vào trước tên lệnh.
+COMMAND_PATTERN = re.compile(
+    rb"^[ \t]*(?:Command|L\xe1\xbb\x87nh)[ \t]*:[ \t]*['_.+-]*([A-Za-z][A-Za-z0-9_-]*)",
+    re.MULTILINE,
+)
+# Số byte đọc tối đa mỗi lần poll; phần còn lại để lần sau nên không có đột biến CPU
+MAX_READ = 256 * 1024
+# Dòng dở dang dài hơn mức này bị bỏ (file nhị phân/dòng rác)
+MAX_PARTIAL = 4096
+
+
+def build_command_index(catalog):
+    # Tên lệnh và mọi alias (viết hoa) -> chỉ số lệnh đầu tiên trong catalog
+    index = {}
+    for entry in range(len(catalog)):
+        index.setdefault(catalog.name(entry).upper(), entry)
+        for key in catalog.alias(entry).split(","):
+            key = key.strip().upper()
+            if key:
+                index.setdefault(key, entry)
+    return index
+
+
+class CommandLogFollower:
+    """Theo dõi phần được ghi thêm vào file log lệnh, chỉ đọc từ vị trí đã đọc lần trước."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = None
+        self.signature = None
+        self.partial = b""
+
+    def poll(self):
+        # Trả về danh sách tên lệnh (viết hoa) xuất hiện từ lần poll trước
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self.offset = None
+            return []
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.signature:
+            return []
+        if self.offset is None:
+            # Lần đầu: bỏ qua lịch sử, chỉ theo dõi từ cuối file
+            self.offset = stat.st_size
+        elif stat.st_size < self.offset:
+            # File bị cắt ngắn hoặc tạo lại: đọc lại từ đầu
+            self.offset = 0
+            self.partial = b""
+        if stat.st_size == self.offset:
+            self.signature = signature
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(MAX_READ)
+        self.offset += len(data)
+        if self.offset >= stat.st_size:
+            self.signature = signature
+        # Chỉ xử lý các dòng đã hoàn chỉnh; phần sau dấu xuống dòng cuối chờ lần sau
+        end = data.rfind(b"\n") + 1
+        lines = self.partial + data[:end] if end else b""
+        self.partial = self.partial + data if not end else data[end:]
+        if len(self.partial) > MAX_PARTIAL:
+            self.partial = b""
+        return [name.decode('ascii').upper() for name in COMMAND_PATTERN.findall(lines)]
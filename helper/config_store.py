@@ -0,0 +1,226 @@
+# coding=utf-8
+import copy
+import json
+import os
+import tempfile
+
+# Cấu hình mặc định
+DEFAULT_CONFIG = {
+    "prev_key": "ctrl+left",
+    "next_key": "ctrl+right",
+    # Phím tắt nhảy trang; chuỗi rỗng để tắt
+    "back10_key": "ctrl+alt+page up",
+    "forward10_key": "ctrl+alt+page down",
+    "first_key": "ctrl+alt+home",
+    "last_key": "ctrl+alt+end",
+    "search_key": "ctrl+alt+f",
+    # Nhảy thẳng tới trang N, ví dụ {"ctrl+alt+1": 1}
+    "page_keys": {},
+    # Gửi alias của dòng N trên trang hiện tại sang AutoCAD, ví dụ {"ctrl+shift+1": 1}
+    "row_keys": {},
+    # Bấm vào một dòng cũng gửi alias + Enter sang cửa sổ đang làm việc
+    "send_on_click": False,
+    # Khoảng cách (ms) giữa hai phím gõ, số lệnh chờ tối đa, cách xử lý khi bấm dồn dập
+    # ("latest", "drop_new", "drop_oldest")
+    "send_interval_ms": 15,
+    "send_queue_depth": 4,
+    "send_policy": "latest",
+    "opacity": 0.95,
+    "bg_color": "#2E2E2E",
+    "text_color": "#FFFFFF",
+    "font_size": 10,
+    "lines_per_page": 5,
+    # Tự tính số dòng mỗi trang theo chiều cao cửa sổ (bỏ qua "lines_per_page")
+    "auto_fit_lines": False,
+    "window_position": {
+        "x": 100,
+        "y": 100
+    },
+    "window_size": {
+        "width": 350,
+        "height": 300
+    },
+    "theme": "dark",
+    # Kiểu hiển thị danh sách lệnh: "labels" (mỗi dòng một Label) hoặc "text" (một tk.Text)
+    "renderer": "labels",
+    # Số trang vẽ sẵn (trang hiện tại, trước, sau); 0 hoặc 1 để tắt
+    "page_buffers": 3,
+    # Danh sách file lệnh (JSON/CSV), đường dẫn tương đối tính từ thư mục chương trình
+    "catalogs": ["catalogs/default.json"],
+    # Bộ lệnh theo chuyên ngành, chỉ nạp khi được chọn: {"Kiến trúc": ["catalogs/arch.json"], ...}
+    "packs": {},
+    # Bộ lệnh đang dùng; chuỗi rỗng là bộ mặc định ("catalogs")
+    "active_pack": "",
+    # Phím tắt chọn bộ lệnh, ví dụ {"ctrl+alt+a": "Kiến trúc"}
+    "pack_keys": {},
+    # Giới hạn tổng kích thước (MB) các bộ lệnh giữ mở để chuyển qua lại tức thì
+    "pack_cache_mb": 64,
+    # Biên dịch trước các bộ lệnh trên luồng nền sau khi cửa sổ đã hiện
+    "warm_packs": True,
+    # File alias của AutoCAD (acad.pgp và các file ghi đè), file sau ghi đè file trước
+    "pgp_files": [],
+    # File log lệnh của AutoCAD (LOGFILEON); để trống để tắt chế độ tự theo lệnh
+    "command_log": ""
+}
+
+
+def merge_config(base, overrides):
+    # Gộp cấu hình đọc từ file vào base; dict lồng nhau được gộp theo từng khóa
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            merge_config(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def validate_config(config, defaults=DEFAULT_CONFIG):
+    # Trả các khóa có kiểu sai về giá trị mặc định; trả về danh sách khóa đã sửa
+    invalid = []
+    for key, default in defaults.items():
+        value = config.get(key)
+        if isinstance(default, bool) or not isinstance(default, (int, float)):
+            valid = isinstance(value, type(default))
+        else:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if not valid:
+            config[key] = copy.deepcopy(default)
+            invalid.append(key)
+    return invalid
+
+
+def write_atomic(path, data, prefix=".tmp-"):
+    # Ghi ra file tạm cùng thư mục rồi đổi tên, tránh file bị cắt cụt
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Thử ghi lại sau (ms) khi lần ghi theo hẹn giờ thất bại (ổ mạng mất kết nối, file bị khóa)
+RETRY_DELAY_MS = 10000
+
+
+class DebouncedWriter:
+    """Gom các yêu cầu lưu liên tiếp thành một lần ghi file nguyên tử."""
+
+    def __init__(self, path, delay_ms=500):
+        self.path = path
+        self.delay_ms = delay_ms
+        # Bộ đếm: số lần yêu cầu lưu và số lần thực sự ghi xuống đĩa
+        self.writes_requested = 0
+        self.writes_performed = 0
+        self._widget = None
+        self._pending = None
+        self._dirty = False
+        # (mtime, kích thước, inode) của file ngay sau lần ghi gần nhất của chính chương trình
+        self.written_signature = None
+
+    def serialize(self):
+        # Lớp con trả về nội dung file dạng bytes
+        raise NotImplementedError
+
+    def attach(self, widget):
+        # Widget Tk dùng để hẹn giờ ghi bằng after()
+        self._widget = widget
+
+    def request_save(self, delay_ms=None):
+        # Đánh dấu cần lưu; các yêu cầu liên tiếp chỉ dẫn tới một lần ghi
+        self.writes_requested += 1
+        self._dirty = True
+        if self._widget is None:
+            self.flush()
+            return
+        self._cancel_pending()
+        delay = self.delay_ms if delay_ms is None else delay_ms
+        self._pending = self._widget.after(delay, self._on_timer)
+
+    def save(self):
+        # Lưu ngay lập tức (ví dụ khi người dùng bấm Lưu trong cài đặt)
+        self.writes_requested += 1
+        self._dirty = True
+        self.flush()
+
+    def flush(self):
+        self._cancel_pending()
+        if not self._dirty:
+            return False
+        write_atomic(self.path, self.serialize())
+        stat = os.stat(self.path)
+        self.written_signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        self._dirty = False
+        self.writes_performed += 1
+        return True
+
+    def try_flush(self):
+        # Như flush() nhưng không ném OSError; dữ liệu vẫn được đánh dấu chưa lưu
+        try:
+            return self.flush()
+        except OSError:
+            return False
+
+    def written_by_self(self, signature):
+        # File vẫn y như lúc chương trình tự ghi: không phải thay đổi từ bên ngoài
+        return signature is not None and signature == self.written_signature
+
+    def _on_timer(self):
+        self._pending = None
+        if not self.try_flush() and self._dirty:
+            self._pending = self._widget.after(RETRY_DELAY_MS, self._on_timer)
+
+    def _cancel_pending(self):
+        if self._pending is not None:
+            try:
+                self._widget.after_cancel(self._pending)
+            except Exception:
+                pass
+            self._pending = None
+
+
+class ConfigStore(DebouncedWriter):
+    """Giữ cấu hình trong bộ nhớ, gom các lần lưu và ghi file nguyên tử."""
+
+    def __init__(self, path, defaults=DEFAULT_CONFIG, delay_ms=500):
+        super().__init__(path, delay_ms)
+        self.defaults = defaults
+        self.data = copy.deepcopy(defaults)
+
+    def load(self):
+        # Đọc cấu hình từ file nếu có, giữ nguyên giá trị mặc định khi lỗi
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    saved_config = json.load(f)
+                if isinstance(saved_config, dict):
+                    merge_config(self.data, saved_config)
+            except (OSError, ValueError):
+                pass
+        validate_config(self.data, self.defaults)
+        return self.data
+
+    def read(self):
+        # Đọc lại file (đã bị sửa từ bên ngoài) thành cấu hình mới, không đụng tới self.data;
+        # None nếu file lỗi để giữ nguyên cấu hình đang chạy
+        try:
+            with open(self.path, 'r') as f:
+                saved_config = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(saved_config, dict):
+            return None
+        config = merge_config(copy.deepcopy(self.defaults), saved_config)
+        validate_config(config, self.defaults)
+        return config
+
+    def serialize(self):
+        return json.dumps(self.data, indent=4).encode('utf-8')
@@ -0,0 +1,321 @@
+# coding=utf-8
+import tkinter as tk
+from tkinter import ttk
+
+from helper.hotkeys import HOTKEY_LABELS, combo_from_key, normalize_hotkey
+from helper.renderers import make_row_renderer
+from helper.themes import THEMES, set_font_size, style_name
+from helper.throttle import FrameThrottle
+
+# Số dòng tối đa mỗi trang theo kiểu hiển thị
+MAX_LINES_PER_PAGE = {"labels": 10, "text": 60}
+
+
+class SettingsDialog:
+    def __init__(self, parent, config, save_callback, theme_compiler, sample=()):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Cài đặt")
+        self.dialog.geometry("500x600")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        self.config = config.copy()
+        self.save_callback = save_callback
+        self.sample = list(sample)
+        
+        # Thanh trượt phát sự kiện liên tục: chỉ áp dụng giá trị mới nhất mỗi khung hình
+        self.throttle = FrameThrottle(self.dialog)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        # Style cho dialog: dùng bộ style đã biên dịch của theme hiện tại
+        self.theme_compiler = theme_compiler
+        palette = theme_compiler.compile(self.config)
+        self.dialog.configure(bg=palette["dialog_background"])
+        
+        # Notebook để tạo các tab
+        self.notebook = ttk.Notebook(self.dialog)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Tab Giao diện
+        self.create_appearance_tab()
+        
+        # Tab Phím tắt
+        self.create_hotkeys_tab()
+        
+        # Nút lưu và hủy
+        btn_frame = ttk.Frame(self.dialog, style=self.style("Settings.TFrame"))
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="Lưu", command=self.save, style=self.style("Save.TButton"), width=10).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(btn_frame, text="Hủy", command=self.cancel, style=self.style("Cancel.TButton"), width=10).pack(side=tk.RIGHT)
+
+    def style(self, base):
+        return style_name(self.config, base)
+    
+    def create_appearance_tab(self):
+        tab = ttk.Frame(self.notebook, style=self.style("Settings.TFrame"))
+        self.notebook.add(tab, text="Giao diện")
+        
+        # Frame chính
+        main_frame = ttk.Frame(tab, style=self.style("Settings.TFrame"))
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        # Chọn theme
+        theme_frame = ttk.LabelFrame(main_frame, text="Giao diện", style=self.style("Settings.TLabelframe"))
+        theme_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.theme_var = tk.StringVar(value=self.config["theme"])
+        for name, theme in THEMES.items():
+            ttk.Radiobutton(
+                theme_frame,
+                text=theme.get("label", name),
+                value=name,
+                variable=self.theme_var,
+                command=self.preview_theme,
+                style=self.style("Settings.TRadiobutton")
+            ).pack(side=tk.LEFT, padx=20, pady=5)
+        
+        # Kiểu hiển thị danh sách lệnh
+        renderer_frame = ttk.LabelFrame(main_frame, text="Kiểu hiển thị", style=self.style("Settings.TLabelframe"))
+        renderer_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.renderer_var = tk.StringVar(value=self.config["renderer"])
+        ttk.Radiobutton(
+            renderer_frame,
+            text="Từng dòng",
+            value="labels",
+            variable=self.renderer_var,
+            command=self.on_renderer_change,
+            style=self.style("Settings.TRadiobutton")
+        ).pack(side=tk.LEFT, padx=20, pady=5)
+        ttk.Radiobutton(
+            renderer_frame,
+            text="Khối văn bản (trang dài)",
+            value="text",
+            variable=self.renderer_var,
+            command=self.on_renderer_change,
+            style=self.style("Settings.TRadiobutton")
+        ).pack(side=tk.LEFT, padx=20, pady=5)
+        
+        # Cỡ chữ và độ trong suốt
+        controls_frame = ttk.LabelFrame(main_frame, text="Điều chỉnh hiển thị", style=self.style("Settings.TLabelframe"))
+        controls_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # Cỡ chữ
+        font_frame = ttk.Frame(controls_frame, style=self.style("Settings.TFrame"))
+        font_frame.pack(fill=tk.X, padx=20, pady=(5,0))
+        ttk.Label(font_frame, text="Cỡ chữ:", style=self.style("Settings.TLabel")).pack(side=tk.LEFT)
+        self.font_var = tk.IntVar(value=self.config["font_size"])
+        self.font_label = ttk.Label(font_frame, text=str(self.font_var.get()), style=self.style("Settings.TLabel"), width=3)
+        self.font_label.pack(side=tk.RIGHT)
+        
+        font_scale = ttk.Scale(
+            controls_frame,
+            from_=8,
+            to=20,
+            variable=self.font_var,
+            command=self.on_font_change
+        )
+        font_scale.pack(fill=tk.X, padx=20, pady=5)
+        
+        # Độ trong suốt
+        opacity_frame = ttk.Frame(controls_frame, style=self.style("Settings.TFrame"))
+        opacity_frame.pack(fill=tk.X, padx=20, pady=(5,0))
+        ttk.Label(opacity_frame, text="Độ trong suốt:", style=self.style("Settings.TLabel")).pack(side=tk.LEFT)
+        self.opacity_var = tk.DoubleVar(value=self.config["opacity"])
+        self.opacity_label = ttk.Label(opacity_frame, text=f"{int(self.opacity_var.get()*100)}%", style=self.style("Settings.TLabel"), width=4)
+        self.opacity_label.pack(side=tk.RIGHT)
+        
+        opacity_scale = ttk.Scale(
+            controls_frame,
+            from_=0.1,
+            to=1.0,
+            variable=self.opacity_var,
+            command=self.on_opacity_change
+        )
+        opacity_scale.pack(fill=tk.X, padx=20, pady=5)
+        
+        # Số dòng hiển thị
+        lines_frame = ttk.Frame(controls_frame, style=self.style("Settings.TFrame"))
+        lines_frame.pack(fill=tk.X, padx=20, pady=(5,0))
+        ttk.Label(lines_frame, text="Số dòng mỗi trang:", style=self.style("Settings.TLabel")).pack(side=tk.LEFT)
+        self.lines_var = tk.IntVar(value=self.config["lines_per_page"])
+        self.lines_label = ttk.Label(lines_frame, text=str(self.lines_var.get()), style=self.style("Settings.TLabel"), width=3)
+        self.lines_label.pack(side=tk.RIGHT)
+        
+        self.lines_scale = ttk.Scale(
+            controls_frame,
+            from_=3,
+            to=MAX_LINES_PER_PAGE.get(self.config["renderer"], 10),
+            variable=self.lines_var,
+            command=self.on_lines_change
+        )
+        self.lines_scale.pack(fill=tk.X, padx=20, pady=5)
+        
+        self.auto_fit_var = tk.BooleanVar(value=self.config["auto_fit_lines"])
+        ttk.Checkbutton(
+            controls_frame,
+            text="Tự động theo chiều cao cửa sổ",
+            variable=self.auto_fit_var,
+            command=self.on_auto_fit_change,
+            style=self.style("Settings.TCheckbutton")
+        ).pack(anchor=tk.W, padx=20, pady=(0, 5))
+        self.on_auto_fit_change()
+        
+        # Preview
+        preview_frame = ttk.LabelFrame(main_frame, text="Xem trước", style=self.style("Settings.TLabelframe"))
+        preview_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        # Dùng đúng kiểu hiển thị của overlay với cấu hình đang chỉnh (không cần bộ đệm trang)
+        self.preview_config = dict(self.config, page_buffers=0)
+        self.preview_frame = ttk.Frame(preview_frame, style=self.style("Custom.TFrame"))
+        self.preview_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.preview_rows = None
+        self.rebuild_preview()
+    
+    def create_hotkeys_tab(self):
+        tab = ttk.Frame(self.notebook, style=self.style("Settings.TFrame"))
+        self.notebook.add(tab, text="Phím tắt")
+        
+        # Mỗi phím tắt một dòng: tổ hợp hiện tại và nút thay đổi
+        self.hotkey_vars = {}
+        for key_type, title in HOTKEY_LABELS:
+            frame = ttk.LabelFrame(tab, text=title, style=self.style("Settings.TLabelframe"))
+            frame.pack(fill=tk.X, padx=10, pady=5)
+            self.hotkey_vars[key_type] = tk.StringVar(value=self.config.get(key_type, ""))
+            ttk.Label(frame, textvariable=self.hotkey_vars[key_type], style=self.style("Settings.TLabel")).pack(side=tk.LEFT, padx=10)
+            ttk.Button(frame, text="Thay đổi", command=lambda k=key_type: self.change_hotkey(k)).pack(side=tk.RIGHT, padx=10)
+        
+        # Gửi alias + Enter sang AutoCAD khi bấm vào một dòng
+        self.send_on_click_var = tk.BooleanVar(value=self.config["send_on_click"])
+        ttk.Checkbutton(
+            tab,
+            text="Bấm vào dòng để gửi lệnh sang AutoCAD",
+            variable=self.send_on_click_var,
+            style=self.style("Settings.TCheckbutton")
+        ).pack(anchor=tk.W, padx=10, pady=10)
+    
+    def rebuild_preview(self):
+        if self.preview_rows is not None:
+            self.preview_rows.destroy()
+        self.preview_rows = make_row_renderer(self.preview_frame, self.preview_config)
+        self.render_preview()
+    
+    def render_preview(self):
+        self.preview_rows.render(self.sample[:self.preview_config["lines_per_page"]])
+    
+    def on_font_change(self, value):
+        self.throttle.submit("font", self.apply_font, int(float(value)))
+    
+    def apply_font(self, size):
+        # Font có tên dùng chung với overlay nên overlay cũng đổi theo ngay; Hủy sẽ trả lại
+        self.font_label.configure(text=str(size))
+        set_font_size(size)
+        
+    def on_opacity_change(self, value):
+        self.throttle.submit("opacity", self.apply_opacity, float(value))
+    
+    def apply_opacity(self, opacity):
+        self.opacity_label.configure(text=f"{int(opacity*100)}%")
+        self.dialog.attributes('-alpha', opacity)
+    
+    def preview_theme(self):
+        # Xem trước bằng style overlay của theme được chọn (biên dịch nếu chưa có)
+        theme = self.theme_var.get()
+        self.theme_compiler.compile(self.config, theme)
+        self.preview_config["theme"] = theme
+        self.preview_frame.configure(style=style_name(self.preview_config, "Custom.TFrame"))
+        self.preview_rows.restyle()
+        self.render_preview()
+    
+    def on_lines_change(self, value):
+        self.throttle.submit("lines", self.apply_lines, int(float(value)))
+    
+    def apply_lines(self, lines):
+        self.lines_label.configure(text=str(lines))
+        if lines != self.preview_config["lines_per_page"]:
+            self.preview_config["lines_per_page"] = lines
+            self.preview_rows.resize(lines)
+            self.render_preview()
+    
+    def on_auto_fit_change(self):
+        # Số dòng do chiều cao cửa sổ quyết định nên khóa thanh trượt
+        self.lines_scale.state(["disabled"] if self.auto_fit_var.get() else ["!disabled"])
+    
+    def on_renderer_change(self):
+        # Kiểu khối văn bản cho phép trang dài hơn
+        max_lines = MAX_LINES_PER_PAGE.get(self.renderer_var.get(), 10)
+        self.lines_scale.configure(to=max_lines)
+        if self.lines_var.get() > max_lines:
+            self.lines_var.set(max_lines)
+            self.on_lines_change(max_lines)
+        self.preview_config["renderer"] = self.renderer_var.get()
+        self.rebuild_preview()
+    
+    def cancel(self):
+        # Bỏ thay đổi: trả cỡ chữ của overlay về như cũ
+        self.throttle.cancel()
+        set_font_size(self.config["font_size"])
+        self.dialog.destroy()
+    
+    def save(self):
+        self.config.update({
+            "theme": self.theme_var.get(),
+            "opacity": self.opacity_var.get(),
+            "font_size": self.font_var.get(),
+            "lines_per_page": self.lines_var.get(),
+            "renderer": self.renderer_var.get(),
+            "auto_fit_lines": self.auto_fit_var.get(),
+            "send_on_click": self.send_on_click_var.get(),
+        })
+        self.throttle.cancel()
+        self.save_callback(self.config)
+        self.dialog.destroy()
+        
+    def change_hotkey(self, key_type):
+        dialog = HotkeyDialog(self.dialog, self.style("Settings.TButton"))
+        self.dialog.wait_window(dialog.dialog)
+        if dialog.result:
+            hotkey = normalize_hotkey(dialog.result)
+            self.config[key_type] = hotkey
+            self.hotkey_vars[key_type].set(hotkey)
+
+
+class HotkeyDialog:
+    def __init__(self, parent, button_style="TButton"):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Cài đặt phím tắt")
+        self.dialog.geometry("300x150")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        self.result = None
+        self.keys = []
+        
+        ttk.Label(self.dialog, text="Nhấn tổ hợp phím bạn muốn sử dụng\nVí dụ: Ctrl + 1, Alt + S,...").pack(pady=10)
+        self.key_label = ttk.Label(self.dialog, text="")
+        self.key_label.pack(pady=10)
+        
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="OK", command=self.ok, style=button_style).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Hủy", command=self.cancel, style=button_style).pack(side=tk.LEFT, padx=5)
+        
+        self.dialog.bind('<KeyPress>', self.on_key_press)
+        self.dialog.bind('<KeyRelease>', self.on_key_release)
+        
+    def on_key_press(self, event):
+        keys = combo_from_key(event.keysym, event.state)
+        if keys:
+            self.keys = keys
+            self.key_label.config(text=" + ".join(self.keys))
+    
+    def on_key_release(self, event):
+        if len(self.keys) > 0:
+            self.result = self.keys
+    
+    def ok(self):
+        self.dialog.destroy()
+        
+    def cancel(self):
+        self.result = None
+        self.dialog.destroy()
@@ -0,0 +1,118 @@
+# coding=utf-8
+import os
+import struct
+import sys
+
+# Chu kỳ (ms) kiểm tra: inotify chỉ là một lần read() không chặn, poll stat thì thưa hơn
+INOTIFY_POLL_MS = 250
+STAT_POLL_MS = 2000
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT = struct.Struct("iIII")
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class StatWatcher:
+    """Phát hiện file bị sửa bằng cách so (mtime, kích thước, inode) sau mỗi chu kỳ."""
+
+    interval_ms = STAT_POLL_MS
+
+    def __init__(self, paths=()):
+        self.signatures = {}
+        self.set_paths(paths)
+
+    def set_paths(self, paths):
+        self.signatures = {
+            os.path.abspath(path): file_signature(path) for path in paths
+        }
+
+    def changed(self):
+        # Các file đã đổi từ lần gọi trước
+        result = []
+        for path, signature in self.signatures.items():
+            current = file_signature(path)
+            if current != signature:
+                self.signatures[path] = current
+                result.append(path)
+        return result
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(StatWatcher):
+    """Theo dõi thư mục chứa file bằng inotify (Linux); không có sự kiện thì không tốn gì."""
+
+    interval_ms = INOTIFY_POLL_MS
+
+    def __init__(self, paths=()):
+        import ctypes
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.directories = {}
+        super().__init__(paths)
+
+    def set_paths(self, paths):
+        super().set_paths(paths)
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        for path in self.signatures:
+            directory = os.path.dirname(path)
+            if directory in self.directories.values():
+                continue
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd >= 0:
+                self.directories[wd] = directory
+
+    def changed(self):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        # Sự kiện chỉ cho biết có thay đổi; so chữ ký để bỏ qua file tạm và sự kiện trùng
+        touched = set()
+        offset = 0
+        while offset + EVENT.size <= len(data):
+            wd, _, _, length = EVENT.unpack_from(data, offset)
+            name = data[offset + EVENT.size:offset + EVENT.size + length].rstrip(b"\0")
+            offset += EVENT.size + length
+            directory = self.directories.get(wd)
+            if directory is not None and name:
+                touched.add(os.path.join(directory, os.fsdecode(name)))
+        result = []
+        for path in touched:
+            if path in self.signatures:
+                current = file_signature(path)
+                if current != self.signatures[path]:
+                    self.signatures[path] = current
+                    result.append(path)
+        return result
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(paths=()):
+    # inotify trên Linux, nếu không được thì poll stat
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return StatWatcher(paths)
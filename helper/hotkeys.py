@@ -0,0 +1,95 @@
+# coding=utf-8
+
+MODIFIER_KEYSYMS = ('Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R')
+
+# Bit trạng thái phím bổ trợ trong sự kiện Tk
+STATE_MODIFIERS = ((0x4, 'Ctrl'), (0x1, 'Shift'), (0x8, 'Alt'))
+
+
+def combo_from_key(keysym, state):
+    # Danh sách phím của tổ hợp, None nếu chỉ nhấn phím bổ trợ
+    if keysym in MODIFIER_KEYSYMS:
+        return None
+    keys = [name for mask, name in STATE_MODIFIERS if state & mask]
+    keys.append(keysym)
+    return keys
+
+
+def normalize_hotkey(keys):
+    # Chuỗi tổ hợp theo cú pháp của thư viện keyboard, ví dụ "ctrl+left"
+    return "+".join(keys).lower()
+
+
+# Khóa cấu hình -> (hành động, tham số) của phím tắt toàn cục
+HOTKEY_ACTIONS = {
+    "prev_key": ("move", -1),
+    "next_key": ("move", 1),
+    "back10_key": ("move", -10),
+    "forward10_key": ("move", 10),
+    "first_key": ("first", None),
+    "last_key": ("last", None),
+    "search_key": ("search", None),
+}
+
+# Hành động phím tắt chạy qua hàng đợi lệnh từ xa (luồng Tk), không qua NavQueue
+QUEUED_ACTIONS = ("pack", "row")
+
+# Tên hiển thị trong hộp thoại cài đặt, theo thứ tự
+HOTKEY_LABELS = (
+    ("prev_key", "Phím lùi trang"),
+    ("next_key", "Phím tiến trang"),
+    ("back10_key", "Lùi 10 trang"),
+    ("forward10_key", "Tiến 10 trang"),
+    ("first_key", "Trang đầu"),
+    ("last_key", "Trang cuối"),
+    ("search_key", "Mở tìm kiếm"),
+)
+
+
+def positive_int(value):
+    # Số trang/số dòng (tính từ 1) hợp lệ, None nếu không phải số nguyên dương
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.isdigit():
+            return None
+        value = int(value)
+    if not isinstance(value, int) or value < 1:
+        return None
+    return value
+
+
+def compile_hotkeys(config):
+    # Bảng tổ hợp phím -> (hành động, tham số); chuỗi rỗng nghĩa là tắt phím đó
+    table = {}
+    for key, action in HOTKEY_ACTIONS.items():
+        hotkey = config.get(key, "").strip().lower()
+        if hotkey:
+            table[hotkey] = action
+    # "page_keys": {"ctrl+alt+1": 1, ...} nhảy thẳng tới trang N (tính từ 1); bỏ qua giá trị
+    # không phải số nguyên dương (0 sẽ thành LAST_PAGE)
+    for hotkey, page in config.get("page_keys", {}).items():
+        hotkey = hotkey.strip().lower()
+        page = positive_int(page)
+        if hotkey and page is not None:
+            table[hotkey] = ("goto", page - 1)
+    # "row_keys": {"ctrl+shift+1": 1, ...} gửi lệnh ở dòng N (tính từ 1) của trang hiện tại
+    for hotkey, row in config.get("row_keys", {}).items():
+        hotkey = hotkey.strip().lower()
+        row = positive_int(row)
+        if hotkey and row is not None:
+            table[hotkey] = ("row", row)
+    # "pack_keys": {"ctrl+alt+a": "Kiến trúc", ...} chọn bộ lệnh
+    for hotkey, pack in config.get("pack_keys", {}).items():
+        hotkey = hotkey.strip().lower()
+        if hotkey:
+            table[hotkey] = ("pack", pack)
+    return table
+
+
+def diff_hotkeys(old, new):
+    # Trả về (phím cần gỡ, phím cần đăng ký) để chỉ đụng tới những phím thay đổi
+    removed = [hotkey for hotkey, action in old.items() if new.get(hotkey) != action]
+    added = {hotkey: action for hotkey, action in new.items() if old.get(hotkey) != action}
+    return removed, added
@@ -0,0 +1,124 @@
+# coding=utf-8
+import collections
+import sys
+import threading
+import time
+
+# Cách xử lý khi bấm dồn dập:
+#   "latest": bỏ các lệnh đang chờ, chỉ gửi lệnh mới nhất
+#   "drop_new": hàng đợi đầy thì bỏ lệnh mới
+#   "drop_oldest": hàng đợi đầy thì bỏ lệnh cũ nhất
+SEND_POLICIES = ("latest", "drop_new", "drop_oldest")
+
+
+def foreground_window():
+    # Cửa sổ đang nhận bàn phím (chỉ Windows), None nếu không xác định được
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    return ctypes.windll.user32.GetForegroundWindow() or None
+
+
+class KeyboardBackend:
+    """Gửi phím thật qua thư viện keyboard tới cửa sổ đang có focus."""
+
+    def __init__(self):
+        import keyboard
+        self.keyboard = keyboard
+
+    def focus(self, window):
+        # Trả focus về cửa sổ (AutoCAD) trước khi gõ, vì bấm chuột vào overlay có thể lấy focus
+        if window is not None and sys.platform == "win32":
+            import ctypes
+            ctypes.windll.user32.SetForegroundWindow(window)
+
+    def write(self, char):
+        self.keyboard.write(char)
+
+    def send(self, key):
+        self.keyboard.send(key)
+
+
+class RecordingBackend:
+    """Backend giả: chỉ ghi lại các phím, dùng để thử nghiệm không cần bàn phím thật."""
+
+    def __init__(self):
+        self.calls = []
+
+    def focus(self, window):
+        self.calls.append(("focus", window, time.perf_counter()))
+
+    def write(self, char):
+        self.calls.append(("write", char, time.perf_counter()))
+
+    def send(self, key):
+        self.calls.append(("send", key, time.perf_counter()))
+
+    def text(self):
+        # Chuỗi đã gõ, Enter ghi thành "\n"
+        return "".join(
+            value if kind == "write" else "\n"
+            for kind, value, _ in self.calls if kind != "focus"
+        )
+
+
+class CommandInjector:
+    """Luồng riêng gõ alias + Enter; luồng Tk chỉ đưa vào hàng đợi, không bao giờ chờ."""
+
+    def __init__(self, backend, config):
+        self.backend = backend
+        # Đọc "send_interval_ms", "send_queue_depth", "send_policy" mỗi lần dùng nên đổi cài đặt có hiệu lực ngay
+        self.config = config
+        self.queue = collections.deque()
+        self.condition = threading.Condition()
+        self.closed = False
+        # Thống kê: đã gửi, bị gộp (trùng lệnh đang chờ), bị bỏ theo chính sách
+        self.sent = 0
+        self.merged = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, text, window=None):
+        # Trả về False nếu lệnh bị bỏ
+        with self.condition:
+            if self.queue and self.queue[-1][0] == text:
+                self.merged += 1
+                return True
+            policy = self.config.get("send_policy", "latest")
+            depth = max(1, self.config.get("send_queue_depth", 4))
+            if policy == "latest":
+                self.dropped += len(self.queue)
+                self.queue.clear()
+            elif len(self.queue) >= depth:
+                if policy == "drop_new":
+                    self.dropped += 1
+                    return False
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append((text, window))
+            self.condition.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.queue and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                text, window = self.queue.popleft()
+            interval = self.config.get("send_interval_ms", 15) / 1000.0
+            self.backend.focus(window)
+            for char in text:
+                self.backend.write(char)
+                time.sleep(interval)
+            self.backend.send("enter")
+            self.sent += 1
+            time.sleep(interval)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.queue.clear()
+            self.condition.notify()
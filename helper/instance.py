@@ -0,0 +1,198 @@
+# coding=utf-8
+import hmac
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+
+from helper.config_store import write_atomic
+from helper.hotkeys import positive_int
+
+# Chỉ nghe trên loopback, cổng do hệ điều hành cấp; cổng và khóa bí mật ghi trong thư mục riêng của người dùng
+IPC_HOST = "127.0.0.1"
+# Thời gian chờ (giây) khi gửi lệnh sang phiên bản đang chạy
+SEND_TIMEOUT = 0.5
+# Số lần thử khi khóa đã bị giữ nhưng phiên bản kia chưa trả lời, chờ tăng dần từ RETRY_DELAY (giây)
+SEND_ATTEMPTS = 5
+RETRY_DELAY = 0.1
+MAX_MESSAGE = 64 * 1024
+
+# Các lệnh điều khiển từ xa: show, page <n>, search <từ khóa>, reload, pack <tên bộ lệnh>,
+# row <dòng> (gửi lệnh ở dòng đó sang AutoCAD)
+REMOTE_ACTIONS = ("show", "page", "search", "reload", "pack", "row")
+
+
+def state_dir():
+    # %APPDATA% là riêng của từng tài khoản (kể cả trên máy chủ terminal nhiều người dùng)
+    return os.path.join(os.getenv('APPDATA') or os.path.expanduser('~'), "AutoCADHelper")
+
+
+def lock_file(f):
+    # Khóa không chờ; hệ điều hành tự nhả khóa khi tiến trình thoát, kể cả khi bị kill
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def parse_message(data, token):
+    # Một dòng JSON: {"token": ..., "commands": [[action, arg], ...]}; None nếu sai khóa bí mật,
+    # bỏ qua lệnh không hợp lệ
+    try:
+        message = json.loads(data.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(message, dict) or not isinstance(message.get("token"), str):
+        return None
+    if not hmac.compare_digest(message["token"].encode('utf-8'), token.encode('utf-8')):
+        return None
+    commands = message.get("commands")
+    if not isinstance(commands, list):
+        return []
+    result = []
+    for command in commands:
+        if not isinstance(command, list) or len(command) != 2:
+            continue
+        action, arg = command
+        if action not in REMOTE_ACTIONS:
+            continue
+        if action in ("page", "row"):
+            # Số trang/số dòng tính từ 1: 0 hay số âm sẽ thành trang cuối / dòng của trang trước
+            arg = positive_int(arg)
+            if arg is None:
+                continue
+        if action in ("search", "pack") and not isinstance(arg, str):
+            continue
+        result.append((action, arg))
+    return result
+
+
+class InstanceGuard:
+    """Một phiên bản cho mỗi người dùng; phiên bản sau gửi lệnh kèm khóa bí mật cho phiên bản đầu rồi thoát."""
+
+    def __init__(self, directory=None, host=IPC_HOST):
+        directory = directory or state_dir()
+        self.directory = directory
+        # Giữ khóa file instance.lock = đang là phiên bản đầu tiên; instance.json chứa cổng và khóa bí mật
+        self.lock_path = os.path.join(directory, "instance.lock")
+        self.info_path = os.path.join(directory, "instance.json")
+        self.host = host
+        self.lock = None
+        self.token = None
+        self.server = None
+        self.thread = None
+
+    def acquire(self):
+        # True nếu đây là phiên bản đầu tiên (giành được khóa file)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            lock = open(self.lock_path, 'ab')
+        except OSError:
+            return False
+        if not lock_file(lock):
+            lock.close()
+            return False
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            server.bind((self.host, 0))
+            server.listen(4)
+            token = secrets.token_hex(16)
+            info = {"port": server.getsockname()[1], "token": token}
+            # mkstemp tạo file chỉ chủ sở hữu đọc được
+            write_atomic(self.info_path, json.dumps(info).encode('utf-8'), prefix=".instance-")
+        except OSError:
+            server.close()
+            lock.close()
+            return False
+        self.lock = lock
+        self.token = token
+        self.server = server
+        return True
+
+    def claim(self, commands, attempts=SEND_ATTEMPTS):
+        # True: đây là phiên bản đầu tiên; False: đã chuyển lệnh cho phiên bản đang chạy;
+        # None: khóa bị giữ nhưng không ai trả lời sau nhiều lần thử (không được mở thêm phiên bản)
+        delay = RETRY_DELAY
+        for _ in range(attempts):
+            if self.acquire():
+                return True
+            if self.send(commands):
+                return False
+            # Phiên bản kia đang thoát (khóa sắp được nhả) hoặc đang bận: chờ rồi thử lại
+            time.sleep(delay)
+            delay *= 2
+        return None
+
+    def send(self, commands, timeout=SEND_TIMEOUT):
+        # Gửi lệnh sang phiên bản đang chạy; True nếu phía kia đã nhận (và chấp nhận khóa bí mật)
+        try:
+            with open(self.info_path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            address = (self.host, int(info["port"]))
+            message = {"token": info["token"], "commands": [list(command) for command in commands]}
+            with socket.create_connection(address, timeout=timeout) as conn:
+                conn.sendall(json.dumps(message).encode('utf-8') + b"\n")
+                return conn.recv(16).startswith(b"ok")
+        except (OSError, ValueError, KeyError, TypeError):
+            # Chưa có instance.json (phiên bản kia vừa giữ khóa) hoặc file cũ: claim() sẽ thử lại
+            return False
+
+    def start(self, handler):
+        # Gọi ngay sau khi giành được khóa, trước khi dựng giao diện: phiên bản sau không phải chờ
+        # handler(action, arg) được gọi trên luồng nghe, nên phải an toàn luồng
+        self.thread = threading.Thread(target=self._serve, args=(handler,), daemon=True)
+        self.thread.start()
+
+    def _serve(self, handler):
+        server = self.server
+        token = self.token
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.settimeout(SEND_TIMEOUT)
+                    data = b""
+                    while not data.endswith(b"\n") and len(data) < MAX_MESSAGE:
+                        chunk = conn.recv(4096)
+                        if not chunk:
+                            break
+                        data += chunk
+                    commands = parse_message(data, token)
+                    if commands is None:
+                        # Sai khóa bí mật: đóng kết nối, không chạy lệnh nào
+                        continue
+                    for action, arg in commands:
+                        handler(action, arg)
+                    conn.sendall(b"ok\n")
+                except OSError:
+                    continue
+
+    def close(self):
+        # shutdown() đánh thức luồng đang chờ accept() rồi mới đóng socket
+        if self.server is not None:
+            try:
+                self.server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.server.close()
+            self.server = None
+        if self.lock is not None:
+            # Xóa instance.json trước khi nhả khóa: phiên bản sau sẽ ghi file mới của nó
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+            self.lock.close()
+            self.lock = None
@@ -0,0 +1,75 @@
+# coding=utf-8
+import json
+import time
+from array import array
+
+# Các mốc thời gian của một lần lật trang bằng phím tắt; "prefetch_end" là lúc vẽ trước xong các trang kề
+STAGES = ("hook", "dequeue", "render_start", "render_end", "idle", "prefetch_end")
+
+
+def percentile(values, fraction):
+    # values đã được sắp xếp
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+class LatencyRecorder:
+    """Bộ đệm vòng kích thước cố định chứa các mốc thời gian phím tắt -> vẽ xong."""
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.samples = array('d', bytes(8 * len(STAGES) * capacity))
+        self.events = array('I', bytes(4 * capacity))
+        self.count = 0
+        # Tổng số phím bấm và số lần vẽ, dùng để tính tần suất
+        self.events_total = 0
+        self.renders_total = 0
+
+    def record(self, hook, dequeue, render_start, render_end, idle, prefetch_end, events=1):
+        slot = self.count % self.capacity
+        base = slot * len(STAGES)
+        self.samples[base:base + len(STAGES)] = array(
+            'd', (hook, dequeue, render_start, render_end, idle, prefetch_end))
+        self.events[slot] = events
+        self.count += 1
+        self.events_total += events
+        self.renders_total += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def rows(self):
+        # Các mẫu theo thứ tự thời gian, mỗi mẫu là tuple các mốc trong STAGES
+        width = len(STAGES)
+        start = self.count - len(self)
+        for n in range(start, self.count):
+            slot = n % self.capacity
+            yield tuple(self.samples[slot * width:(slot + 1) * width]), self.events[slot]
+
+    def summary(self):
+        # p50/p95/p99 (ms) cho từng chặng
+        # Vẽ trước trang kề chạy sau khi trang mới đã hiện nên tính riêng, không cộng vào "total"
+        spans = {"queue": [], "render": [], "paint": [], "total": [], "prefetch": []}
+        for (hook, dequeue, render_start, render_end, idle, prefetch_end), _ in self.rows():
+            spans["queue"].append((dequeue - hook) * 1000)
+            spans["render"].append((render_end - render_start) * 1000)
+            spans["paint"].append((idle - render_end) * 1000)
+            spans["total"].append((idle - hook) * 1000)
+            spans["prefetch"].append((prefetch_end - idle) * 1000)
+        result = {}
+        for name, values in spans.items():
+            values.sort()
+            result[name] = tuple(percentile(values, f) for f in (0.50, 0.95, 0.99))
+        return result
+
+    def export_jsonl(self, path):
+        # Mỗi dòng một mẫu, thời gian tính bằng giây (perf_counter)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"exported_at": time.time(), "samples": len(self)}) + "\n")
+            for stamps, events in self.rows():
+                record = dict(zip(STAGES, stamps))
+                record["events"] = events
+                f.write(json.dumps(record) + "\n")
+        return path
@@ -0,0 +1,47 @@
+# coding=utf-8
+import collections
+import time
+
+# Giá trị trang đặc biệt: trang cuối cùng
+LAST_PAGE = -1
+
+
+class NavQueue:
+    """Hàng đợi lệnh điều hướng từ luồng hook bàn phím sang luồng Tk."""
+
+    def __init__(self):
+        # deque.append/popleft là nguyên tử trong CPython nên không cần khóa:
+        # luồng hook chỉ thêm vào, luồng Tk chỉ lấy ra
+        self._events = collections.deque()
+
+    def push(self, action, arg=None):
+        # Gọi từ luồng hook: không bao giờ chờ việc vẽ giao diện
+        self._events.append((action, arg, time.perf_counter()))
+
+    def drain(self):
+        # Gom cả loạt phím bấm thành (trang đích, độ dời, có mở tìm kiếm không,
+        # thời điểm phím đầu tiên được bấm, số phím). Lệnh nhảy trang tuyệt đối
+        # xóa các độ dời trước nó.
+        target = None
+        delta = 0
+        search = False
+        fired_at = None
+        count = 0
+        while True:
+            try:
+                action, arg, stamp = self._events.popleft()
+            except IndexError:
+                return target, delta, search, fired_at, count
+            if fired_at is None:
+                fired_at = stamp
+            count += 1
+            if action == "move":
+                delta += arg
+            elif action == "goto":
+                target, delta = arg, 0
+            elif action == "first":
+                target, delta = 0, 0
+            elif action == "last":
+                target, delta = LAST_PAGE, 0
+            elif action == "search":
+                search = True
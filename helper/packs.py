@@ -0,0 +1,116 @@
+# coding=utf-8
+import collections
+import os
+import sys
+import threading
+
+from helper.catalog import ensure_cache, load_catalogs
+
+
+def catalog_size(catalog):
+    # Tổng kích thước các file cache mà catalog đang mmap
+    total = 0
+    for part in catalog.catalogs:
+        try:
+            total += os.path.getsize(part.path)
+        except OSError:
+            pass
+    return total
+
+
+def extras_size(extras):
+    # Ước lượng bộ nhớ dữ liệu dựng thêm của một bộ lệnh: giá trị là tuple (khóa, đối tượng);
+    # chỉ mục tìm kiếm tự báo nbytes, các bảng dict tính theo kích thước bảng băm
+    total = 0
+    for value in list(extras.values()):
+        obj = value[-1]
+        total += getattr(obj, "nbytes", None) or sys.getsizeof(obj)
+    return total
+
+
+class PackCache:
+    """LRU các bộ lệnh đã mở, giới hạn theo tổng kích thước (cache mmap + chỉ mục); bộ lệnh bị loại sẽ được đóng (munmap)."""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Khóa là tuple đường dẫn nguồn -> (catalog, kích thước, dữ liệu dựng thêm); cuối là bộ dùng gần nhất
+        self.entries = collections.OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.warm_thread = None
+
+    def get(self, paths):
+        key = tuple(paths)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            # Chỉ mục của các bộ khác có thể đã dựng xong trên luồng nền từ lần trước
+            self._evict()
+            return entry[0]
+        self.misses += 1
+        catalog = load_catalogs(paths, self.cache_dir)
+        size = catalog_size(catalog)
+        self.entries[key] = (catalog, size, {})
+        self.total_bytes += size
+        self._evict()
+        return catalog
+
+    def resident_bytes(self):
+        # File cache đang mmap cộng với chỉ mục/catalog có alias dựng cho từng bộ
+        return self.total_bytes + sum(extras_size(entry[2]) for entry in self.entries.values())
+
+    def _evict(self):
+        # Luôn giữ bộ đang dùng (cuối danh sách) dù nó lớn hơn giới hạn
+        while len(self.entries) > 1 and self.resident_bytes() > self.max_bytes:
+            _, (catalog, size, _) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            catalog.close()
+
+    def extras(self, paths):
+        # Dữ liệu dựng từ bộ lệnh (catalog có alias PGP, chỉ mục tìm kiếm), bị loại cùng bộ lệnh
+        entry = self.entries.get(tuple(paths))
+        return {} if entry is None else entry[2]
+
+    def discard(self, paths):
+        # Bỏ bộ lệnh khỏi cache (ví dụ file nguồn vừa đổi) để lần sau mở lại từ đầu
+        entry = self.detach(paths)
+        if entry is not None:
+            entry[0].close()
+
+    def detach(self, paths):
+        # Lấy bộ lệnh ra khỏi cache nhưng chưa đóng: catalog cũ vẫn dùng được tới khi bản mới nạp xong
+        entry = self.entries.pop(tuple(paths), None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+        return entry
+
+    def restore(self, paths, entry):
+        # Trả lại bộ lệnh đã detach (nạp bản mới thất bại); bỏ bản mới nạp dở nếu có
+        self.discard(paths)
+        if entry is not None:
+            self.entries[tuple(paths)] = entry
+            self.total_bytes += entry[1]
+
+    def warm(self, path_lists):
+        # Biên dịch trước file cache của các bộ lệnh trên luồng nền; chưa mở (mmap) nên không tốn bộ nhớ
+        paths = [path for path_list in path_lists for path in path_list]
+        if not paths or self.warm_thread is not None:
+            return
+        self.warm_thread = threading.Thread(target=self._warm, args=(paths,), daemon=True)
+        self.warm_thread.start()
+
+    def _warm(self, paths):
+        for path in paths:
+            try:
+                ensure_cache(path, self.cache_dir)
+            except (OSError, ValueError, KeyError):
+                continue
+
+    def close(self):
+        for catalog, _, _ in self.entries.values():
+            catalog.close()
+        self.entries.clear()
+        self.total_bytes = 0
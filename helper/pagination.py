@@ -0,0 +1,68 @@
+# coding=utf-8
+
+
+class PageView:
+    """Phân trang trên một dãy lệnh phẳng; vị trí hiện tại lưu theo chỉ số lệnh."""
+
+    def __init__(self, entries, lines_per_page, position=0):
+        self.entries = entries
+        self.lines_per_page = max(1, lines_per_page)
+        self.position = 0
+        self.seek(position)
+
+    @property
+    def page(self):
+        return self.position // self.lines_per_page
+
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.entries) // self.lines_per_page))
+
+    def set_lines_per_page(self, lines_per_page):
+        # O(1): không tạo lại danh sách trang, lệnh hiện tại vẫn nằm trên trang hiển thị
+        self.lines_per_page = max(1, lines_per_page)
+
+    def set_entries(self, entries, position=0):
+        self.entries = entries
+        self.seek(position)
+
+    def seek(self, position):
+        # Đưa vị trí về trong phạm vi dãy lệnh
+        self.position = max(0, min(position, len(self.entries) - 1))
+
+    def page_range(self, page=None):
+        if page is None:
+            page = self.page
+        start = page * self.lines_per_page
+        return start, min(start + self.lines_per_page, len(self.entries))
+
+    def rows(self, page=None):
+        start, end = self.page_range(page)
+        return self.entries[start:end]
+
+    def goto_page(self, page):
+        # Trả về True nếu trang hiển thị thay đổi
+        page = max(0, min(page, self.page_count - 1))
+        if page == self.page:
+            return False
+        self.seek(page * self.lines_per_page)
+        return True
+
+    def move(self, delta):
+        return self.goto_page(self.page + delta)
+
+
+class ResultView:
+    """Dãy con của catalog (kết quả tìm kiếm, lệnh hay dùng), phân trang giống catalog."""
+
+    def __init__(self, catalog, ids):
+        self.catalog = catalog
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.catalog[i] for i in self.ids[index]]
+        return self.catalog[self.ids[index]]
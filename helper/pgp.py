@@ -0,0 +1,172 @@
+# coding=utf-8
+import hashlib
+import os
+import re
+
+from helper.catalog import Entry, catalog_fingerprint, format_entry
+
+# Số dòng mỗi khối; khối nào không đổi nội dung thì dùng lại kết quả phân tích cũ
+BLOCK_LINES = 512
+
+# Dòng alias có dạng "L,        *LINE"; chú thích (;) và lệnh ngoài (không có *) không khớp
+ALIAS_PATTERN = re.compile(r"^[ \t]*([^;,\s][^,\r\n]*?)[ \t]*,[ \t]*\*[ \t]*([^\r\n]*?)[ \t]*$", re.M)
+
+
+def parse_pgp_block(block):
+    # Trả về danh sách (alias, lệnh) đã viết hoa
+    return ALIAS_PATTERN.findall(block.decode('utf-8', 'replace').upper())
+
+
+class PgpFile:
+    """Một file .pgp, chỉ phân tích lại các khối đã thay đổi."""
+
+    def __init__(self, path):
+        self.path = path
+        self.pairs = []
+        self._stat = None
+        self._blocks = {}
+
+    def refresh(self):
+        # Trả về True nếu nội dung alias có thể đã thay đổi
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature == self._stat:
+            return False
+        self._stat = signature
+        if signature is None:
+            self.pairs = []
+            self._blocks = {}
+            return True
+        self._reparse()
+        return True
+
+    def _reparse(self):
+        # Đọc từng dòng, gom thành khối, chỉ phân tích khối có hash mới
+        blocks = {}
+        pairs = []
+        chunk = []
+
+        def take(chunk):
+            block = b"".join(chunk)
+            key = hashlib.sha1(block).digest()
+            parsed = self._blocks.get(key)
+            if parsed is None:
+                parsed = parse_pgp_block(block)
+            blocks[key] = parsed
+            pairs.extend(parsed)
+
+        with open(self.path, 'rb') as f:
+            for line in f:
+                chunk.append(line)
+                if len(chunk) == BLOCK_LINES:
+                    take(chunk)
+                    chunk = []
+        if chunk:
+            take(chunk)
+        self._blocks = blocks
+        self.pairs = pairs
+
+
+class PgpAliases:
+    """Gộp acad.pgp và các file ghi đè; alias định nghĩa sau thắng alias trước."""
+
+    def __init__(self, paths):
+        self.files = [PgpFile(path) for path in paths]
+        self.by_command = {}
+
+    def refresh(self):
+        changed = False
+        for pgp in self.files:
+            if pgp.refresh():
+                changed = True
+        if changed:
+            self._rebuild()
+        return changed
+
+    def _rebuild(self):
+        commands = {}
+        for pgp in self.files:
+            commands.update(pgp.pairs)
+        by_command = {}
+        for alias, command in commands.items():
+            by_command.setdefault(command, []).append(alias)
+        # Alias ngắn nhất đứng đầu
+        for aliases in by_command.values():
+            if len(aliases) > 1:
+                aliases.sort(key=len)
+        self.by_command = by_command
+
+
+class AliasedCatalog:
+    """Catalog có alias lấy từ file PGP; lệnh chỉ có trong PGP được thêm vào cuối."""
+
+    # Tên nhóm của các lệnh chỉ có trong PGP
+    EXTRAS_GROUP = "PGP"
+
+    def __init__(self, base, by_command):
+        self.base = base
+        self.by_command = by_command
+        self.base_count = len(base)
+        names = {base.name(i).upper() for i in range(self.base_count)}
+        self.extras = [command for command in sorted(by_command) if command not in names]
+        # Lệnh chỉ có trong PGP nằm sau catalog gốc nên cũng là một phần của dấu vân tay
+        extras = "\n".join(self.extras).encode('utf-8')
+        self.fingerprint = hashlib.sha1(catalog_fingerprint(base) + extras).digest()
+
+    def __len__(self):
+        return self.base_count + len(self.extras)
+
+    def name(self, index):
+        if index >= self.base_count:
+            return self.extras[index - self.base_count]
+        return self.base.name(index)
+
+    def alias(self, index):
+        aliases = self.by_command.get(self.name(index).upper())
+        if aliases:
+            return ", ".join(aliases)
+        return self.base.alias(index) if index < self.base_count else ""
+
+    def description(self, index):
+        return self.base.description(index) if index < self.base_count else ""
+
+    def tags(self, index):
+        return self.base.tags(index) if index < self.base_count else ()
+
+    @property
+    def group_count(self):
+        return self.base.group_count + 1
+
+    def group_of(self, index):
+        if index >= self.base_count:
+            return self.base.group_count
+        return self.base.group_of(index)
+
+    def group_name(self, group):
+        if group == self.base.group_count:
+            return self.EXTRAS_GROUP
+        return self.base.group_name(group)
+
+    def _check(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return index
+
+    def entry(self, index):
+        return Entry(self, self._check(index))
+
+    def _display(self, index):
+        return format_entry(self.name(index), self.alias(index), self.description(index))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._display(i) for i in range(*index.indices(len(self)))]
+        return self._display(self._check(index))
+
+    def close(self):
+        self.base.close()
@@ -0,0 +1,249 @@
+# coding=utf-8
+import tkinter as tk
+from tkinter import ttk
+
+from helper.themes import FONT_FAMILY, OVERLAY_FONT, style_name, theme_palette
+
+# Khoảng cách thêm vào mỗi dòng ngoài chiều cao font (pady của Label, spacing1/3 của Text)
+ROW_PADDING = {"labels": 4, "text": 4}
+# Chiều cao dòng chữ (linespace) theo cỡ chữ, chỉ đo một lần cho mỗi cỡ
+_LINE_HEIGHTS = {}
+
+
+def row_height(root, config):
+    size = config["font_size"]
+    height = _LINE_HEIGHTS.get(size)
+    if height is None:
+        from tkinter import font
+        height = _LINE_HEIGHTS[size] = font.Font(root, family=FONT_FAMILY, size=size).metrics("linespace")
+    return height + ROW_PADDING.get(config.get("renderer"), 4)
+
+
+def fit_lines(root, config, height):
+    # Số dòng vừa với chiều cao height (pixel), ít nhất một dòng
+    return max(1, height // row_height(root, config))
+
+
+class LabelRowRenderer:
+    """Bộ ttk.Label cố định, tái sử dụng cho mỗi lần lật trang."""
+
+    def __init__(self, parent, config, on_click=None):
+        self.parent = parent
+        self.config = config
+        self.on_click = on_click
+        self.labels = []
+        self.resize(config["lines_per_page"])
+
+    def resize(self, count):
+        # Chỉ tạo/xóa widget khi số dòng mỗi trang thay đổi
+        while len(self.labels) < count:
+            label = ttk.Label(self.parent, text="", style=style_name(self.config, "Custom.TLabel"))
+            label.pack(anchor=tk.W, pady=2)
+            label.bind('<Enter>', self._on_enter)
+            label.bind('<Leave>', self._on_leave)
+            label.bind('<Button-1>', self._on_button)
+            self.labels.append(label)
+        while len(self.labels) > count:
+            self.labels.pop().destroy()
+
+    def render(self, lines):
+        # Chỉ đổi text, không tạo lại widget hay binding
+        for i, label in enumerate(self.labels):
+            text = lines[i] if i < len(lines) else ""
+            if label.cget("text") != text:
+                label.configure(text=text)
+
+    def _on_enter(self, event):
+        # Hiệu ứng hover chỉ dùng cho theme có màu hover (theme tối)
+        hover = theme_palette(self.config)["hover"]
+        if hover:
+            event.widget.configure(foreground=hover)
+
+    def _on_leave(self, event):
+        # Trả màu chữ về theo style hiện tại
+        event.widget.configure(foreground="")
+
+    def _on_button(self, event):
+        if self.on_click is not None:
+            self.on_click(self.labels.index(event.widget))
+
+    def restyle(self):
+        # Màu và font nằm trong style đã biên dịch: chỉ cần trỏ sang style của theme mới
+        style = style_name(self.config, "Custom.TLabel")
+        for label in self.labels:
+            label.configure(style=style)
+
+    def prepare(self, lines):
+        # Chỉ có một bộ dòng nên không vẽ trước được
+        pass
+
+    def destroy(self):
+        self.resize(0)
+
+
+class TextRowRenderer:
+    """Vẽ cả trang vào một tk.Text; hover xử lý bằng một handler <Motion> duy nhất."""
+
+    def __init__(self, parent, config, on_click=None):
+        self.parent = parent
+        self.config = config
+        self.on_click = on_click
+        self.lines = None
+        self.hover_line = None
+        self.text = tk.Text(
+            parent,
+            height=config["lines_per_page"],
+            wrap=tk.NONE,
+            borderwidth=0,
+            highlightthickness=0,
+            cursor="arrow",
+            spacing1=2,
+            spacing3=2,
+            state=tk.DISABLED,
+        )
+        self.text.pack(fill=tk.BOTH, expand=True)
+        self.text.bind('<Motion>', self._on_motion)
+        self.text.bind('<Leave>', self._on_leave)
+        self.text.bind('<Button-1>', self._on_button)
+        self.restyle()
+
+    def restyle(self):
+        # Gọi lại khi đổi theme (cỡ chữ đi theo font có tên OVERLAY_FONT)
+        palette = theme_palette(self.config)
+        self.text.configure(
+            font=OVERLAY_FONT,
+            background=palette["background"],
+            foreground=palette["foreground"],
+        )
+        self.text.tag_configure("hover", foreground=palette["hover"] or "")
+
+    def resize(self, count):
+        self.text.configure(height=count)
+
+    def render(self, lines):
+        # Thay toàn bộ nội dung trong một lần
+        if lines == self.lines:
+            return
+        self.lines = lines
+        self.hover_line = None
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state=tk.DISABLED)
+
+    def _line_at(self, event):
+        # Dòng (tính từ 1) dưới con trỏ; None ở vùng trống dưới các dòng, vì index("@x,y")
+        # luôn trả về dòng gần nhất
+        line = int(self.text.index(f"@{event.x},{event.y}").split(".")[0])
+        if line > len(self.lines or ()):
+            return None
+        info = self.text.dlineinfo(f"{line}.0")
+        if info is None or not info[1] <= event.y < info[1] + info[3]:
+            return None
+        return line
+
+    def _on_motion(self, event):
+        line = self._line_at(event)
+        if line == self.hover_line:
+            return
+        self.text.tag_remove("hover", "1.0", tk.END)
+        self.hover_line = line
+        if line is not None:
+            self.text.tag_add("hover", f"{line}.0", f"{line}.end")
+
+    def _on_leave(self, event):
+        self.hover_line = None
+        self.text.tag_remove("hover", "1.0", tk.END)
+
+    def _on_button(self, event):
+        if self.on_click is not None:
+            line = self._line_at(event)
+            if line is not None:
+                self.on_click(line - 1)
+
+    def prepare(self, lines):
+        pass
+
+    def destroy(self):
+        self.text.destroy()
+
+
+class BufferedRowRenderer:
+    """Nhiều bộ đệm trang xếp chồng bằng place(); lật trang chỉ là lift() bộ đệm đã vẽ sẵn."""
+
+    def __init__(self, parent, config, on_click=None, buffers=3):
+        self.parent = parent
+        self.config = config
+        # Mỗi bộ đệm: [frame, renderer, nội dung đang vẽ]; cuối danh sách là dùng gần nhất
+        self.buffers = []
+        for _ in range(max(2, buffers)):
+            frame = ttk.Frame(parent, style=style_name(config, "Custom.TFrame"))
+            frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+            rows = RENDERERS.get(config.get("renderer"), LabelRowRenderer)(frame, config, on_click)
+            self.buffers.append([frame, rows, None])
+        self.visible = self.buffers[-1]
+        self.visible[0].lift()
+
+    def _acquire(self, key):
+        # Lấy bộ đệm đang chứa key, nếu không có thì bộ đệm cũ nhất không hiển thị
+        for buffer in self.buffers:
+            if buffer[2] == key:
+                break
+        else:
+            buffer = next(b for b in self.buffers if b is not self.visible)
+        self.buffers.remove(buffer)
+        self.buffers.append(buffer)
+        return buffer
+
+    def _fill(self, buffer, lines, key):
+        if buffer[2] != key:
+            buffer[1].render(lines)
+            buffer[2] = key
+
+    def render(self, lines):
+        key = tuple(lines)
+        buffer = self._acquire(key)
+        self._fill(buffer, lines, key)
+        if buffer is not self.visible:
+            buffer[0].lift()
+            self.visible = buffer
+
+    def prepare(self, lines):
+        # Vẽ trước một trang vào bộ đệm ẩn (gọi từ after_idle)
+        key = tuple(lines)
+        buffer = self._acquire(key)
+        self._fill(buffer, lines, key)
+
+    def invalidate(self):
+        for buffer in self.buffers:
+            buffer[2] = None
+
+    def resize(self, count):
+        for buffer in self.buffers:
+            buffer[1].resize(count)
+        self.invalidate()
+
+    def restyle(self):
+        style = style_name(self.config, "Custom.TFrame")
+        for buffer in self.buffers:
+            buffer[0].configure(style=style)
+            buffer[1].restyle()
+        self.invalidate()
+
+    def destroy(self):
+        for buffer in self.buffers:
+            buffer[0].destroy()
+
+
+RENDERERS = {
+    "labels": LabelRowRenderer,
+    "text": TextRowRenderer,
+}
+
+
+def make_row_renderer(parent, config, on_click=None):
+    # Chọn kiểu hiển thị theo cấu hình "renderer"; "page_buffers" > 1 bật vẽ trước trang kề
+    buffers = config.get("page_buffers", 0)
+    if buffers > 1:
+        return BufferedRowRenderer(parent, config, on_click, buffers)
+    return RENDERERS.get(config.get("renderer"), LabelRowRenderer)(parent, config, on_click)
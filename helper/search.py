@@ -0,0 +1,95 @@
+# coding=utf-8
+import sys
+import unicodedata
+from array import array
+
+
+def fold(text):
+    # Chữ thường, bỏ dấu tiếng Việt: "Vẽ đường" -> "ve duong"
+    text = text.lower().replace('đ', 'd')
+    if text.isascii():
+        return text
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if not unicodedata.combining(c))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Chỉ mục trigram trên tên, alias và mô tả của từng lệnh trong catalog."""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.texts = [fold(catalog[i]) for i in range(len(catalog))]
+        postings = {}
+        for entry, text in enumerate(self.texts):
+            for gram in trigrams(text):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array('I')
+                ids.append(entry)
+        self.postings = postings
+        # Ước lượng bộ nhớ (byte) để PackCache tính vào giới hạn của các bộ lệnh đang giữ
+        self.nbytes = (
+            sys.getsizeof(self.texts) + sum(map(sys.getsizeof, self.texts))
+            + sys.getsizeof(postings) + sum(sys.getsizeof(gram) + sys.getsizeof(ids) for gram, ids in postings.items())
+        )
+
+    def lookup(self, query):
+        # Giao các danh sách trigram (ngắn nhất trước) rồi kiểm tra chuỗi con
+        grams = trigrams(query)
+        if not grams:
+            return [i for i, text in enumerate(self.texts) if query in text]
+        lists = []
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if ids is None:
+                return []
+            lists.append(ids)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            keep = set(ids)
+            candidates = [i for i in candidates if i in keep]
+            if not candidates:
+                return []
+        texts = self.texts
+        return [i for i in candidates if query in texts[i]]
+
+
+def scan(catalog, query, ids=None):
+    # Tìm tuần tự (không cần chỉ mục), dùng trong lúc chỉ mục còn đang dựng trên luồng nền
+    if ids is None:
+        ids = range(len(catalog))
+    return [i for i in ids if query in fold(catalog[i])]
+
+
+class IncrementalSearch:
+    """Tìm kiếm khi gõ: thu hẹp kết quả trước nếu truy vấn mới chứa truy vấn cũ."""
+
+    def __init__(self, catalog, index=None):
+        self.catalog = catalog
+        # None cho tới khi chỉ mục dựng xong; gán vào sau để các lần gõ tiếp theo dùng chỉ mục
+        self.index = index
+        self.query = ""
+        self.results = None
+
+    def update(self, text):
+        query = fold(text.strip())
+        if not query:
+            self.query, self.results = "", None
+            return None
+        index = self.index
+        if self.results is not None and self.query in query:
+            if index is None:
+                results = scan(self.catalog, query, self.results)
+            else:
+                texts = index.texts
+                results = [i for i in self.results if query in texts[i]]
+        elif index is None:
+            results = scan(self.catalog, query)
+        else:
+            results = index.lookup(query)
+        self.query, self.results = query, results
+        return results
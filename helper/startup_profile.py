@@ -0,0 +1,25 @@
+# coding=utf-8
+import time
+
+
+class StartupProfiler:
+    """Ghi thời gian từng giai đoạn khởi động (bật bằng --profile-startup)."""
+
+    def __init__(self, start=None, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, name):
+        # Kết thúc giai đoạn hiện tại, tính từ lần mark trước
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = ["Thời gian khởi động:"]
+        for name, elapsed in self.phases:
+            lines.append(f"  {name:<22}{elapsed * 1000:9.2f} ms")
+        lines.append(f"  {'tổng':<22}{(self.last - self.start) * 1000:9.2f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,140 @@
+# coding=utf-8
+import json
+import os
+
+# Font có tên dùng chung cho overlay: đổi cỡ chữ chỉ cần cấu hình lại font này
+OVERLAY_FONT = "AutoCADHelperFont"
+OVERLAY_BOLD_FONT = "AutoCADHelperBoldFont"
+FONT_FAMILY = "Arial"
+
+# Theme dạng dữ liệu; "foreground": None nghĩa là dùng "text_color" trong cấu hình
+BUILTIN_THEMES = {
+    "dark": {
+        "label": "Tối",
+        "background": "#000000",
+        "foreground": None,
+        "hover": "#00FF00",
+        "dialog_background": "#2E2E2E",
+        "dialog_foreground": "#FFFFFF",
+        "button_background": "#000000",
+        "button_foreground": "#FFFFFF",
+        "save_foreground": "#28a745",
+        "cancel_foreground": "#dc3545",
+    },
+    "light": {
+        "label": "Sáng",
+        "background": "#F0F0F0",
+        "foreground": "#000000",
+        "hover": None,
+        "dialog_background": "#F0F0F0",
+        "dialog_foreground": "#000000",
+        "button_background": "#F0F0F0",
+        "button_foreground": "#000000",
+        "save_foreground": "#28a745",
+        "cancel_foreground": "#dc3545",
+    },
+}
+
+# Các theme đang dùng được: có sẵn + nạp từ file
+THEMES = dict(BUILTIN_THEMES)
+
+
+def load_theme_files(directory):
+    # Mỗi file .json là một theme: {"name": ..., "base": "dark", các màu ghi đè}
+    if not os.path.isdir(directory):
+        return []
+    names = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(data, dict):
+            continue
+        name = data.pop("name", os.path.splitext(filename)[0])
+        theme = dict(BUILTIN_THEMES.get(data.pop("base", "dark"), BUILTIN_THEMES["dark"]))
+        theme["label"] = name
+        theme.update(data)
+        THEMES[name] = theme
+        names.append(name)
+    return names
+
+
+def theme_palette(config):
+    # Màu của theme hiện tại, đã thay màu chữ theo cấu hình nếu cần
+    palette = dict(THEMES.get(config["theme"], BUILTIN_THEMES["dark"]))
+    if palette["foreground"] is None:
+        palette["foreground"] = config["text_color"]
+    return palette
+
+
+def style_prefix(name):
+    # "dark" -> "Dark", "my blue" -> "MyBlue"
+    return "".join(c for c in name.title() if c.isalnum()) or "Theme"
+
+
+def style_name(config, base):
+    # Tên style đã biên dịch của theme hiện tại, ví dụ "Dark.Custom.TLabel"
+    return f"{style_prefix(config['theme'])}.{base}"
+
+
+def create_fonts(root, config):
+    # Tạo (một lần) các font có tên dùng trong style của overlay
+    from tkinter import font
+    return {
+        OVERLAY_FONT: font.Font(root, name=OVERLAY_FONT, family=FONT_FAMILY,
+                                size=config["font_size"], exists=False),
+        OVERLAY_BOLD_FONT: font.Font(root, name=OVERLAY_BOLD_FONT, family=FONT_FAMILY,
+                                     size=config["font_size"], weight="bold", exists=False),
+    }
+
+
+def set_font_size(size):
+    # Đổi cỡ chữ của mọi widget dùng font có tên chỉ bằng một lần configure
+    from tkinter import font
+    for name in (OVERLAY_FONT, OVERLAY_BOLD_FONT):
+        named = font.nametofont(name)
+        if named.cget("size") != size:
+            named.configure(size=size)
+
+
+class ThemeCompiler:
+    """Biên dịch mỗi theme thành một bộ style ttk có tên riêng, chỉ một lần."""
+
+    def __init__(self, style):
+        self.style = style
+        self._compiled = {}
+
+    def compile(self, config, name=None):
+        # Trả về palette; style chỉ được cấu hình khi theme chưa biên dịch hoặc màu đã đổi
+        name = config["theme"] if name is None else name
+        palette = theme_palette(dict(config, theme=name))
+        if self._compiled.get(name) == palette:
+            return palette
+        prefix = style_prefix(name)
+        configure = self.style.configure
+        background = palette["background"]
+        foreground = palette["foreground"]
+        dialog_background = palette["dialog_background"]
+        dialog_foreground = palette["dialog_foreground"]
+
+        configure(f"{prefix}.Custom.TFrame", background=background)
+        configure(f"{prefix}.Custom.TLabel", font=OVERLAY_FONT, background=background, foreground=foreground)
+        configure(f"{prefix}.Custom.Title.TLabel", font=OVERLAY_BOLD_FONT, background=background, foreground=foreground)
+        configure(f"{prefix}.Custom.TButton", background=palette["button_background"], foreground=palette["button_foreground"])
+
+        configure(f"{prefix}.Settings.TFrame", background=dialog_background)
+        configure(f"{prefix}.Settings.TLabel", background=dialog_background, foreground=dialog_foreground)
+        configure(f"{prefix}.Settings.TRadiobutton", background=dialog_background, foreground=dialog_foreground)
+        configure(f"{prefix}.Settings.TCheckbutton", background=dialog_background, foreground=dialog_foreground)
+        configure(f"{prefix}.Settings.TLabelframe", background=dialog_background, foreground=dialog_foreground)
+        configure(f"{prefix}.Settings.TLabelframe.Label", background=dialog_background, foreground=dialog_foreground)
+        configure(f"{prefix}.Settings.TButton", background=palette["button_background"], foreground=palette["button_foreground"])
+        configure(f"{prefix}.Save.TButton", background=palette["button_background"], foreground=palette["save_foreground"])
+        configure(f"{prefix}.Cancel.TButton", background=palette["button_background"], foreground=palette["cancel_foreground"])
+
+        self._compiled[name] = palette
+        return palette
@@ -0,0 +1,40 @@
+# coding=utf-8
+import time
+
+# Khoảng cách tối thiểu giữa hai lần áp dụng (~60 Hz)
+FRAME_MS = 16
+
+
+class FrameThrottle:
+    """Gom các giá trị đến dồn dập (kéo thanh trượt...), mỗi khung hình chỉ áp dụng giá trị mới nhất."""
+
+    def __init__(self, widget, interval_ms=FRAME_MS):
+        self.widget = widget
+        self.interval = interval_ms / 1000.0
+        self.pending = {}
+        self.after_id = None
+        self.last_flush = 0.0
+        # Số giá trị nhận được và số lần thực sự áp dụng
+        self.submitted = 0
+        self.applied = 0
+
+    def submit(self, key, apply, value):
+        # Giá trị mới thay giá trị đang chờ cùng key; chỉ đặt một timer cho mỗi khung hình
+        self.pending[key] = (apply, value)
+        self.submitted += 1
+        if self.after_id is None:
+            wait = self.last_flush + self.interval - time.perf_counter()
+            self.after_id = self.widget.after(max(0, int(wait * 1000)), self.flush)
+
+    def flush(self):
+        self.cancel()
+        pending, self.pending = self.pending, {}
+        for apply, value in pending.values():
+            apply(value)
+            self.applied += 1
+        self.last_flush = time.perf_counter()
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
@@ -0,0 +1,108 @@
+# coding=utf-8
+import collections
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Số sự kiện tối đa giữ trong bộ nhớ; sự kiện cũ nhất bị bỏ khi đầy
+TRACE_CAPACITY = 200000
+# Số dòng thống kê bộ nhớ ghi ra cho mỗi lần chụp
+SNAPSHOT_TOP = 30
+# Mã phím ảo Shift của Windows
+VK_SHIFT = 0x10
+
+
+def modifier_held(key=VK_SHIFT):
+    # Giữ phím (mặc định Shift) khi khởi động để bật chế độ trace; hỏi thẳng Windows, không nạp thư viện keyboard
+    if sys.platform != "win32":
+        return False
+    import ctypes
+    return bool(ctypes.windll.user32.GetAsyncKeyState(key) & 0x8000)
+
+
+class Tracer:
+    """Ghi span/sự kiện theo định dạng Chrome trace (chrome://tracing, Perfetto).
+
+    Chỉ được tạo khi bật --trace: các hàm được bọc lúc khởi động, nên khi tắt
+    không có lớp bọc nào và đường nóng không tốn thêm gì.
+    """
+
+    def __init__(self, capacity=TRACE_CAPACITY):
+        import tracemalloc
+        self.tracemalloc = tracemalloc
+        tracemalloc.start()
+        # Mỗi sự kiện: (ph, tên, bắt đầu, kết thúc, thread id, args) với thời gian perf_counter
+        self.events = collections.deque(maxlen=capacity)
+        self.start = time.perf_counter()
+        self.main_thread = threading.get_ident()
+        self.snapshot = None
+
+    def wrap(self, name, fn):
+        events = self.events
+        clock = time.perf_counter
+        get_ident = threading.get_ident
+
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            began = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                events.append(("X", name, began, clock(), get_ident(), None))
+        return traced
+
+    def instrument(self, obj, names):
+        # Thay phương thức của đúng đối tượng này bằng bản có span
+        prefix = type(obj).__name__
+        for name in names:
+            setattr(obj, name, self.wrap(f"{prefix}.{name}", getattr(obj, name)))
+
+    def instant(self, name, args=None):
+        now = time.perf_counter()
+        self.events.append(("i", name, now, now, threading.get_ident(), args))
+
+    def counter(self, name, values):
+        now = time.perf_counter()
+        self.events.append(("C", name, now, now, threading.get_ident(), values))
+
+    def take_snapshot(self, path):
+        # Chụp tracemalloc, ghi các dòng cấp phát nhiều nhất (so với lần chụp trước nếu có)
+        snapshot = self.tracemalloc.take_snapshot()
+        if self.snapshot is not None:
+            stats = snapshot.compare_to(self.snapshot, "lineno")
+            title = "So với lần chụp trước"
+        else:
+            stats = snapshot.statistics("lineno")
+            title = "Từ lúc khởi động"
+        self.snapshot = snapshot
+        current, peak = self.tracemalloc.get_traced_memory()
+        self.counter("tracemalloc", {"current_kb": current // 1024, "peak_kb": peak // 1024})
+        self.instant("snapshot", {"path": path})
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"{title}: hiện tại {current / 1024:.0f} KB, đỉnh {peak / 1024:.0f} KB\n")
+            for stat in stats[:SNAPSHOT_TOP]:
+                f.write(f"{stat}\n")
+        return path
+
+    def export(self, path):
+        # Ghi file JSON mở được bằng chrome://tracing hoặc ui.perfetto.dev (thời gian tính bằng µs)
+        pid = os.getpid()
+        trace = [
+            {"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": "AutoCAD Helper"}},
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": self.main_thread, "args": {"name": "Tk"}},
+        ]
+        for ph, name, began, end, tid, args in list(self.events):
+            event = {"ph": ph, "name": name, "pid": pid, "tid": tid, "ts": (began - self.start) * 1e6}
+            if ph == "X":
+                event["dur"] = (end - began) * 1e6
+            elif ph == "i":
+                event["s"] = "t"
+            if args:
+                event["args"] = args
+            trace.append(event)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return path
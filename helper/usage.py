@@ -0,0 +1,171 @@
+# coding=utf-8
+import math
+import struct
+import time
+from array import array
+
+from helper.config_store import DebouncedWriter
+
+# File usage: header (kèm dấu vân tay catalog) | điểm log2 của từng lệnh (float64) | số lần dùng (uint32)
+#   | điểm, số lần dùng của các lệnh tạm không có trong catalog | tên lệnh (UTF-8, ngăn cách bằng \0):
+#   một tên cho mỗi chỉ số ("" nếu chưa dùng) rồi tới tên các lệnh tạm vắng
+USAGE_MAGIC = b"ACHU"
+USAGE_VERSION = 3
+HEADER = struct.Struct("<4sHHII20s")
+
+# Sau khoảng thời gian này (giây) điểm của một lệnh giảm một nửa
+HALF_LIFE = 7 * 24 * 3600
+UNUSED = float("-inf")
+
+
+class UsageStats(DebouncedWriter):
+    """Thống kê tần suất/độ mới theo chỉ số lệnh, lưu vào file nhị phân nhỏ.
+
+    Điểm được lưu dưới dạng log2(điểm) + thời điểm/HALF_LIFE nên mọi lệnh cùng
+    suy giảm như nhau: thứ tự chỉ thay đổi khi có lệnh được dùng, vì vậy danh
+    sách "hay dùng" chỉ cần cập nhật cho đúng lệnh vừa dùng.
+    """
+
+    def __init__(self, path, hot_size=10, delay_ms=2000):
+        super().__init__(path, delay_ms)
+        self.hot_size = hot_size
+        self.scores = array('d')
+        self.counts = array('I')
+        # Tên lệnh ở từng chỉ số đã dùng, để kiểm tra/ánh xạ lại khi catalog đổi
+        self.names = []
+        # Lệnh đã dùng nhưng không có trong catalog đang gắn (ví dụ một file nguồn tạm lỗi):
+        # tên -> (điểm, số lần dùng), được trả lại khi catalog có lệnh đó
+        self.orphans = {}
+        # Catalog mà các chỉ số thuộc về và số lệnh của nó (None khi chưa gắn catalog)
+        self.fingerprint = b""
+        self.catalog_size = None
+        self._hot = None
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            magic, version, _, count, orphan_count, fingerprint = HEADER.unpack_from(raw, 0)
+            if magic != USAGE_MAGIC or version != USAGE_VERSION:
+                return self
+            at = HEADER.size
+            scores = array('d', raw[at:at + 8 * count])
+            at += 8 * count
+            counts = array('I', raw[at:at + 4 * count])
+            at += 4 * count
+            orphan_scores = array('d', raw[at:at + 8 * orphan_count])
+            at += 8 * orphan_count
+            orphan_counts = array('I', raw[at:at + 4 * orphan_count])
+            at += 4 * orphan_count
+            names = raw[at:].decode('utf-8').split("\0") if count + orphan_count else []
+            if len(scores) != count or len(orphan_counts) != orphan_count or len(names) != count + orphan_count:
+                raise ValueError("usage file bị cắt cụt")
+            self.scores, self.counts, self.names = scores, counts, names[:count]
+            self.orphans = dict(zip(names[count:], zip(orphan_scores, orphan_counts)))
+            self.fingerprint = fingerprint
+        except (OSError, ValueError, struct.error):
+            self.scores = array('d')
+            self.counts = array('I')
+            self.names = []
+            self.orphans = {}
+            self.fingerprint = b""
+        self._hot = None
+        return self
+
+    def serialize(self):
+        orphans = list(self.orphans.items())
+        names = "\0".join(self.names + [name for name, _ in orphans])
+        return HEADER.pack(USAGE_MAGIC, USAGE_VERSION, 0, len(self.scores), len(orphans), self.fingerprint) \
+            + self.scores.tobytes() + self.counts.tobytes() \
+            + array('d', [score for _, (score, _) in orphans]).tobytes() \
+            + array('I', [count for _, (_, count) in orphans]).tobytes() \
+            + names.encode('utf-8')
+
+    def bind_catalog(self, catalog, fingerprint):
+        # Gắn thống kê vào catalog đang hiển thị. Chỉ khi tên ở các chỉ số đã dùng không còn khớp
+        # (đổi thứ tự, thiếu file nguồn) mới ánh xạ lại theo tên; không bao giờ xóa thống kê
+        self.catalog_size = len(catalog)
+        self._hot = None
+        if fingerprint == self.fingerprint:
+            return
+        size = self.catalog_size
+        if not self.orphans and all(
+            entry < size and catalog.name(entry) == name for entry, name in enumerate(self.names) if name
+        ):
+            # Ví dụ thêm lệnh vào cuối, sửa mô tả: chỉ số vẫn đúng
+            self.fingerprint = fingerprint
+            return
+        self._remap(catalog)
+        self.fingerprint = fingerprint
+
+    def _remap(self, catalog):
+        # Quét tên trong catalog một lần; lệnh không tìm thấy được giữ lại trong orphans
+        pending = dict(self.orphans)
+        for entry, name in enumerate(self.names):
+            if name:
+                pending[name] = (self.scores[entry], self.counts[entry])
+        found = {}
+        for entry in range(len(catalog)):
+            name = catalog.name(entry)
+            if name in pending and name not in found:
+                found[name] = entry
+        self.scores = array('d')
+        self.counts = array('I')
+        self.names = []
+        self._grow(max(found.values(), default=-1) + 1)
+        for name, entry in found.items():
+            self.scores[entry], self.counts[entry] = pending.pop(name)
+            self.names[entry] = name
+        self.orphans = pending
+
+    def _grow(self, size):
+        missing = size - len(self.scores)
+        if missing > 0:
+            self.scores.extend([UNUSED] * missing)
+            self.counts.extend([0] * missing)
+            self.names.extend([""] * missing)
+
+    def score(self, entry, now=None):
+        # Điểm hiện tại (đã suy giảm) của một lệnh
+        if entry >= len(self.scores) or self.scores[entry] == UNUSED:
+            return 0.0
+        now = time.time() if now is None else now
+        return 2.0 ** (self.scores[entry] - now / HALF_LIFE)
+
+    def record(self, entry, name="", now=None):
+        # Ghi nhận một lần dùng; việc ghi file được gom lại
+        now = time.time() if now is None else now
+        self._grow(entry + 1)
+        self.names[entry] = name
+        self.scores[entry] = math.log2(self.score(entry, now) + 1.0) + now / HALF_LIFE
+        self.counts[entry] += 1
+        self._update_hot(entry)
+        self.request_save()
+
+    def hot(self):
+        # Các lệnh hay dùng nhất, điểm cao đứng trước
+        if self._hot is None:
+            scores = self.scores if self.catalog_size is None else self.scores[:self.catalog_size]
+            used = [i for i, score in enumerate(scores) if score != UNUSED]
+            used.sort(key=self.scores.__getitem__, reverse=True)
+            self._hot = used[:self.hot_size]
+        return self._hot
+
+    def set_hot_size(self, hot_size):
+        if hot_size != self.hot_size:
+            self.hot_size = hot_size
+            self._hot = None
+
+    def _update_hot(self, entry):
+        # Chỉ sắp lại danh sách ngắn, không quét toàn bộ catalog
+        if self._hot is None:
+            return
+        hot = self._hot
+        if entry in hot:
+            hot.remove(entry)
+        scores = self.scores
+        position = len(hot)
+        while position > 0 and scores[hot[position - 1]] < scores[entry]:
+            position -= 1
+        hot.insert(position, entry)
+        del hot[self.hot_size:]
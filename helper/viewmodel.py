@@ -0,0 +1,181 @@
+# coding=utf-8
+import threading
+
+from helper.catalog import catalog_fingerprint
+from helper.pagination import PageView, ResultView
+from helper.themes import theme_palette
+
+
+class OverlayModel:
+    """Trạng thái hiển thị của overlay (catalog, phân trang, tìm kiếm), không phụ thuộc Tk."""
+
+    def __init__(self, config, catalog=(), usage=None):
+        self.config = config
+        self.catalog = catalog
+        self.view = catalog
+        self.pages = PageView(catalog, config["lines_per_page"])
+        self.search = None
+        # Chỉ mục của catalog: "search"/"command" -> (catalog, chỉ mục); dict do PackCache giữ
+        # nên chuyển bộ lệnh qua lại không phải dựng lại, và chỉ dùng khi catalog vẫn khớp
+        self.indexes = {}
+        self._index_building = None
+        self.usage = usage
+        self.showing_hot = False
+
+    @property
+    def searching(self):
+        return self.search is not None
+
+    @property
+    def search_index(self):
+        # Chỉ mục trigram của catalog hiện tại, None nếu chưa dựng xong (không bao giờ chặn luồng Tk)
+        built = self.indexes.get("search")
+        if built is None or built[0] is not self.catalog:
+            return None
+        return built[1]
+
+    def build_search_index(self):
+        # Dựng chỉ mục trigram trên luồng nền; trả về luồng đó, hoặc None nếu đã có/đang dựng
+        catalog = self.catalog
+        if self.search_index is not None or self._index_building is catalog:
+            return None
+        self._index_building = catalog
+        thread = threading.Thread(target=self._build_search_index, args=(catalog, self.indexes), daemon=True)
+        thread.start()
+        return thread
+
+    def _build_search_index(self, catalog, indexes):
+        from helper.search import SearchIndex
+        try:
+            index = SearchIndex(catalog)
+        except (ValueError, IndexError):
+            # Catalog bị đóng (bộ lệnh bị loại khỏi cache) trong lúc dựng
+            return
+        # Một phép gán: luồng Tk thấy hoặc không thấy, không bao giờ thấy nửa chừng
+        indexes["search"] = (catalog, index)
+
+    @property
+    def command_index(self):
+        # Tên lệnh/alias -> chỉ số lệnh, dựng một lần cho mỗi catalog
+        built = self.indexes.get("command")
+        if built is None or built[0] is not self.catalog:
+            from helper.command_log import build_command_index
+            built = self.indexes["command"] = (self.catalog, build_command_index(self.catalog))
+        return built[1]
+
+    def set_catalog(self, catalog, indexes=None):
+        # Giữ vị trí hiện tại; chỉ mục tìm kiếm được dựng lại trên luồng nền khi đã dựng cho catalog cũ
+        # indexes: dict sống cùng catalog (mục của PackCache), có thể đã chứa chỉ mục dựng từ trước
+        rebuild = self._index_building is not None
+        self.catalog = catalog
+        self.indexes = {} if indexes is None else indexes
+        if self.usage is not None:
+            self.usage.bind_catalog(catalog, catalog_fingerprint(catalog))
+        if rebuild:
+            self.build_search_index()
+        if self.search is not None:
+            from helper.search import IncrementalSearch
+            query = self.search.query
+            self.search = IncrementalSearch(catalog, self.search_index)
+            self.set_query(query)
+        elif self.showing_hot:
+            self._show_hot_view()
+        else:
+            self.view = catalog
+            self.pages.set_entries(catalog, self.pages.position)
+
+    def start_search(self):
+        self.showing_hot = False
+        if self.search is None:
+            from helper.search import IncrementalSearch
+            self.search = IncrementalSearch(self.catalog, self.search_index)
+            # Bình thường chỉ mục đã được dựng sau lần vẽ đầu; nếu chưa thì dựng ngay trên luồng nền
+            self.build_search_index()
+
+    def stop_search(self):
+        self.search = None
+        self.view = self.catalog
+        self.pages.set_entries(self.view)
+
+    def set_query(self, text):
+        # Thu hẹp danh sách theo từ khóa, phân trang lại từ trang đầu
+        if self.search is not None and self.search.index is None:
+            self.search.index = self.search_index
+        results = self.search.update(text) if self.search is not None else None
+        if results is None:
+            self.view = self.catalog
+        else:
+            self.view = ResultView(self.catalog, results)
+        self.pages.set_entries(self.view)
+
+    def apply_lines_per_page(self):
+        self.pages.set_lines_per_page(self.config["lines_per_page"])
+        if self.usage is not None:
+            self.usage.set_hot_size(self.config["lines_per_page"])
+            if self.showing_hot:
+                self._show_hot_view()
+
+    def show_hot(self, enabled):
+        # Trang "hay dùng": các lệnh xếp theo điểm tần suất/độ mới
+        self.showing_hot = enabled and self.usage is not None
+        if self.showing_hot:
+            self.search = None
+            self._show_hot_view()
+        else:
+            self.view = self.catalog
+            self.pages.set_entries(self.view)
+
+    def _show_hot_view(self):
+        self.view = ResultView(self.catalog, list(self.usage.hot()))
+        self.pages.set_entries(self.view)
+
+    def follow_command(self, command):
+        # Đưa trang chứa lệnh vừa dùng trong AutoCAD lên; không làm gián đoạn khi đang tìm kiếm
+        if self.view is not self.catalog:
+            return False
+        entry = self.command_index.get(command)
+        if entry is None:
+            return False
+        page = self.pages.page
+        self.pages.seek(entry)
+        return self.pages.page != page
+
+    def entry_index(self, row):
+        # Chỉ số trong catalog của dòng thứ row trên trang hiện tại
+        position = self.pages.page_range()[0] + row
+        if position >= len(self.view):
+            return None
+        if self.view is self.catalog:
+            return position
+        return self.view.ids[position]
+
+    def record_use(self, entry):
+        if self.usage is None:
+            return
+        self.usage.record(entry, self.catalog.name(entry))
+        if self.showing_hot:
+            self._show_hot_view()
+
+    def move(self, delta):
+        return self.pages.move(delta)
+
+    def rows(self):
+        return self.pages.rows()
+
+    def sample(self, count):
+        # Tối đa count dòng bắt đầu từ trang hiện tại (dùng cho phần xem trước)
+        start = self.pages.page_range()[0]
+        if len(self.view) - start < count:
+            start = max(0, len(self.view) - count)
+        return list(self.view[start:start + count])
+
+    def page_label(self):
+        if self.showing_hot:
+            return "Lệnh hay dùng"
+        text = f"Trang {self.pages.page + 1}/{self.pages.page_count}"
+        if self.view is not self.catalog:
+            text += f" - {len(self.view)} kết quả"
+        return text
+
+    def palette(self):
+        return theme_palette(self.config)
@@ -1,382 +1,284 @@
 # coding=utf-8
+import time
+
+# Mốc thời gian bắt đầu nạp chương trình, dùng cho --profile-startup
+STARTUP_T0 = time.perf_counter()
+
 import tkinter as tk
-from tkinter import ttk, messagebox
-import keyboard
-import json
+from tkinter import ttk
+import collections
 import os
 import sys
 
-class SettingsDialog:
-    def __init__(self, parent, config, save_callback):
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.title("Cài đặt")
-        self.dialog.geometry("500x600")
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        
-        self.config = config.copy()
-        self.save_callback = save_callback
-        
-        # Style cho dialog
-        style = ttk.Style()
-        if self.config["theme"] == "dark":
-            self.dialog.configure(bg="#2E2E2E")
-            style.configure("Settings.TFrame", background="#2E2E2E")
-            style.configure("Settings.TLabel", background="#2E2E2E", foreground="#FFFFFF")
-            style.configure("Settings.TLabelframe", background="#2E2E2E", foreground="#FFFFFF")
-            style.configure("Settings.TLabelframe.Label", background="#2E2E2E", foreground="#FFFFFF")
-            style.configure("Settings.TButton", background="#000000", foreground="#FFFFFF")
-            # Nút Lưu màu xanh, Hủy màu đỏ với nền đen
-            style.configure("Save.TButton", background="#000000", foreground="#28a745")
-            style.configure("Cancel.TButton", background="#000000", foreground="#dc3545")
-        
-        # Notebook để tạo các tab
-        self.notebook = ttk.Notebook(self.dialog)
-        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Tab Giao diện
-        self.create_appearance_tab()
-        
-        # Tab Phím tắt
-        self.create_hotkeys_tab()
-        
-        # Nút lưu và hủy
-        btn_frame = ttk.Frame(self.dialog, style="Settings.TFrame")
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        ttk.Button(btn_frame, text="Lưu", command=self.save, style="Save.TButton", width=10).pack(side=tk.RIGHT, padx=5)
-        ttk.Button(btn_frame, text="Hủy", command=self.dialog.destroy, style="Cancel.TButton", width=10).pack(side=tk.RIGHT)
+from helper.config_store import ConfigStore
+from helper.file_watch import create_watcher, file_signature
+from helper.hotkeys import QUEUED_ACTIONS, compile_hotkeys, diff_hotkeys, positive_int
+from helper.instance import InstanceGuard
+from helper.latency import LatencyRecorder
+from helper.nav_queue import LAST_PAGE, NavQueue
+from helper.packs import PackCache
+from helper.renderers import fit_lines, make_row_renderer
+from helper.startup_profile import StartupProfiler
+from helper.themes import ThemeCompiler, create_fonts, load_theme_files, set_font_size, style_name
+from helper.usage import UsageStats
+from helper.viewmodel import OverlayModel
 
-    def create_appearance_tab(self):
-        tab = ttk.Frame(self.notebook, style="Settings.TFrame")
-        self.notebook.add(tab, text="Giao diện")
-        
-        # Frame chính
-        main_frame = ttk.Frame(tab, style="Settings.TFrame")
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
-        
-        # Chọn theme
-        theme_frame = ttk.LabelFrame(main_frame, text="Giao diện", style="Settings.TLabelframe")
-        theme_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        self.theme_var = tk.StringVar(value=self.config["theme"])
-        ttk.Radiobutton(
-            theme_frame,
-            text="Tối",
-            value="dark",
-            variable=self.theme_var,
-            command=self.preview_theme,
-            style="Settings.TRadiobutton"
-        ).pack(side=tk.LEFT, padx=20, pady=5)
-        ttk.Radiobutton(
-            theme_frame,
-            text="Sáng",
-            value="light",
-            variable=self.theme_var,
-            command=self.preview_theme,
-            style="Settings.TRadiobutton"
-        ).pack(side=tk.LEFT, padx=20, pady=5)
-        
-        # Cỡ chữ và độ trong suốt
-        controls_frame = ttk.LabelFrame(main_frame, text="Điều chỉnh hiển thị", style="Settings.TLabelframe")
-        controls_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        # Cỡ chữ
-        font_frame = ttk.Frame(controls_frame, style="Settings.TFrame")
-        font_frame.pack(fill=tk.X, padx=20, pady=(5,0))
-        ttk.Label(font_frame, text="Cỡ chữ:", style="Settings.TLabel").pack(side=tk.LEFT)
-        self.font_var = tk.IntVar(value=self.config["font_size"])
-        self.font_label = ttk.Label(font_frame, text=str(self.font_var.get()), style="Settings.TLabel", width=3)
-        self.font_label.pack(side=tk.RIGHT)
-        
-        font_scale = ttk.Scale(
-            controls_frame,
-            from_=8,
-            to=20,
-            variable=self.font_var,
-            command=self.on_font_change
-        )
-        font_scale.pack(fill=tk.X, padx=20, pady=5)
-        
-        # Độ trong suốt
-        opacity_frame = ttk.Frame(controls_frame, style="Settings.TFrame")
-        opacity_frame.pack(fill=tk.X, padx=20, pady=(5,0))
-        ttk.Label(opacity_frame, text="Độ trong suốt:", style="Settings.TLabel").pack(side=tk.LEFT)
-        self.opacity_var = tk.DoubleVar(value=self.config["opacity"])
-        self.opacity_label = ttk.Label(opacity_frame, text=f"{int(self.opacity_var.get()*100)}%", style="Settings.TLabel", width=4)
-        self.opacity_label.pack(side=tk.RIGHT)
-        
-        opacity_scale = ttk.Scale(
-            controls_frame,
-            from_=0.1,
-            to=1.0,
-            variable=self.opacity_var,
-            command=self.on_opacity_change
-        )
-        opacity_scale.pack(fill=tk.X, padx=20, pady=5)
-        
-        # Số dòng hiển thị
-        lines_frame = ttk.Frame(controls_frame, style="Settings.TFrame")
-        lines_frame.pack(fill=tk.X, padx=20, pady=(5,0))
-        ttk.Label(lines_frame, text="Số dòng mỗi trang:", style="Settings.TLabel").pack(side=tk.LEFT)
-        self.lines_var = tk.IntVar(value=self.config["lines_per_page"])
-        self.lines_label = ttk.Label(lines_frame, text=str(self.lines_var.get()), style="Settings.TLabel", width=3)
-        self.lines_label.pack(side=tk.RIGHT)
-        
-        lines_scale = ttk.Scale(
-            controls_frame,
-            from_=3,
-            to=10,
-            variable=self.lines_var,
-            command=self.on_lines_change
-        )
-        lines_scale.pack(fill=tk.X, padx=20, pady=5)
-        
-        # Preview
-        preview_frame = ttk.LabelFrame(main_frame, text="Xem trước", style="Settings.TLabelframe")
-        preview_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        
-        self.preview_label = ttk.Label(
-            preview_frame,
-            text="LINE (L) - Vẽ đường thẳng\nCIRCLE (C) - Vẽ đường tròn",
-            style="Settings.TLabel",
-            justify=tk.LEFT
-        )
-        self.preview_label.pack(padx=20, pady=10)
-    
-    def create_hotkeys_tab(self):
-        tab = ttk.Frame(self.notebook, style="Settings.TFrame")
-        self.notebook.add(tab, text="Phím tắt")
-        
-        # Phím lùi
-        prev_frame = ttk.LabelFrame(tab, text="Phím lùi trang", style="Settings.TLabelframe")
-        prev_frame.pack(fill=tk.X, padx=10, pady=5)
-        self.prev_key_var = tk.StringVar(value=self.config["prev_key"])
-        ttk.Label(prev_frame, textvariable=self.prev_key_var, style="Settings.TLabel").pack(side=tk.LEFT, padx=10)
-        ttk.Button(prev_frame, text="Thay đổi", command=lambda: self.change_hotkey("prev_key")).pack(side=tk.RIGHT, padx=10)
-        
-        # Phím tiến
-        next_frame = ttk.LabelFrame(tab, text="Phím tiến trang", style="Settings.TLabelframe")
-        next_frame.pack(fill=tk.X, padx=10, pady=5)
-        self.next_key_var = tk.StringVar(value=self.config["next_key"])
-        ttk.Label(next_frame, textvariable=self.next_key_var, style="Settings.TLabel").pack(side=tk.LEFT, padx=10)
-        ttk.Button(next_frame, text="Thay đổi", command=lambda: self.change_hotkey("next_key")).pack(side=tk.RIGHT, padx=10)
-    
-    def on_font_change(self, value):
-        size = int(float(value))
-        self.font_label.configure(text=str(size))
-        self.preview_label.configure(font=("Arial", size))
-        
-    def on_opacity_change(self, value):
-        opacity = float(value)
-        self.opacity_label.configure(text=f"{int(opacity*100)}%")
-        self.dialog.attributes('-alpha', opacity)
-    
-    def preview_theme(self):
-        theme = self.theme_var.get()
-        if theme == "dark":
-            self.preview_label.configure(style="Settings.TLabel")
-        else:
-            self.preview_label.configure(style="")
-    
-    def on_lines_change(self, value):
-        lines = int(float(value))
-        self.lines_label.configure(text=str(lines))
-        # Cập nhật xem trước với số dòng mới
-        preview_text = "\n".join([f"LINE {i+1} - Dòng mẫu {i+1}" for i in range(lines)])
-        self.preview_label.configure(text=preview_text)
-    
-    def save(self):
-        self.config.update({
-            "theme": self.theme_var.get(),
-            "opacity": self.opacity_var.get(),
-            "font_size": self.font_var.get(),
-            "lines_per_page": self.lines_var.get(),
-        })
-        self.save_callback(self.config)
-        self.dialog.destroy()
-        
-    def change_hotkey(self, key_type):
-        dialog = HotkeyDialog(self.dialog)
-        self.dialog.wait_window(dialog.dialog)
-        if dialog.result:
-            self.config[key_type] = dialog.result.lower()
-            if key_type == "prev_key":
-                self.prev_key_var.set(dialog.result.lower())
-            else:
-                self.next_key_var.set(dialog.result.lower())
-
-class HotkeyDialog:
-    def __init__(self, parent):
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.title("Cài đặt phím tắt")
-        self.dialog.geometry("300x150")
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        
-        self.result = None
-        self.keys = []
-        
-        ttk.Label(self.dialog, text="Nhấn tổ hợp phím bạn muốn sử dụng\nVí dụ: Ctrl + 1, Alt + S,...").pack(pady=10)
-        self.key_label = ttk.Label(self.dialog, text="")
-        self.key_label.pack(pady=10)
-        
-        btn_frame = ttk.Frame(self.dialog)
-        btn_frame.pack(pady=10)
-        ttk.Button(btn_frame, text="OK", command=self.ok, style="Settings.TButton").pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Hủy", command=self.cancel, style="Settings.TButton").pack(side=tk.LEFT, padx=5)
-        
-        self.dialog.bind('<KeyPress>', self.on_key_press)
-        self.dialog.bind('<KeyRelease>', self.on_key_release)
-        
-    def on_key_press(self, event):
-        if event.keysym not in ['Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R']:
-            key = []
-            if event.state & 0x4:
-                key.append('Ctrl')
-            if event.state & 0x1:
-                key.append('Shift')
-            if event.state & 0x8:
-                key.append('Alt')
-            key.append(event.keysym)
-            self.keys = key
-            self.key_label.config(text=" + ".join(self.keys))
-    
-    def on_key_release(self, event):
-        if len(self.keys) > 0:
-            self.result = "+".join(self.keys)
-    
-    def ok(self):
-        self.dialog.destroy()
-        
-    def cancel(self):
-        self.result = None
-        self.dialog.destroy()
+# Chu kỳ (ms) luồng Tk lấy lệnh chuyển trang từ hàng đợi phím tắt
+NAV_TICK_MS = 15
+# Chu kỳ (ms) kiểm tra file PGP có bị sửa hay không
+PGP_POLL_MS = 500
+# Chu kỳ (ms) đọc phần mới ghi thêm vào file log lệnh của AutoCAD
+COMMAND_LOG_POLL_MS = 250
+# Các phương thức được bọc span khi chạy với --trace
+TRACED_METHODS = (
+    "update_commands", "reorganize_commands", "apply_settings", "save_config",
+    "jump_page", "queue_remote",
+)
+# Chờ (ms) sau thay đổi cuối cùng của config.json/catalog trước khi nạp lại
+RELOAD_DEBOUNCE_MS = 300
+# Chu kỳ (ms) cập nhật bảng hiệu năng (HUD)
+HUD_REFRESH_MS = 500
 
 class AutoCADHelper:
-    def __init__(self):
-        self.current_page = 0
-        self.config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+    def __init__(self, profiler=None, guard=None, tracer=None, remote_commands=None):
+        self.profiler = profiler or StartupProfiler()
+        self.guard = guard
+        # Chế độ trace: bọc sẵn các đường nóng; khi tắt (None) không có lớp bọc nào
+        self.tracer = tracer
+        if tracer is not None:
+            tracer.instrument(self, TRACED_METHODS)
+        self.app_dir = os.path.dirname(os.path.abspath(__file__))
+        self.config_file = os.path.join(self.app_dir, "config.json")
+        self.cache_dir = os.path.join(self.app_dir, "cache")
         self.bat_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "start_helper.bat")
         self.startup_path = os.path.join(
             os.getenv('APPDATA'),
             r'Microsoft\Windows\Start Menu\Programs\Startup\AutoCADHelper.lnk'
         )
         self.load_config()
-        self.commands_source = [
-            # Trang 1: Lệnh vẽ cơ bản
-            [
-                "LINE (L) - Vẽ đường thẳng",
-                "CIRCLE (C) - Vẽ đường tròn",
-                "RECTANGLE (REC) - Vẽ hình chữ nhật",
-                "ARC (A) - Vẽ cung tròn",
-                "POLYLINE (PL) - Vẽ đường đa tuyến"
-            ],
-            # Trang 2: Chỉnh sửa đối tượng
-            [
-                "MOVE (M) - Di chuyển đối tượng",
-                "COPY (CO) - Sao chép đối tượng",
-                "ROTATE (RO) - Xoay đối tượng",
-                "SCALE (SC) - Thay đổi tỷ lệ",
-                "STRETCH (S) - Kéo giãn đối tượng"
-            ],
-            # Trang 3: Sửa đổi nâng cao
-            [
-                "TRIM (TR) - Cắt đối tượng",
-                "EXTEND (EX) - Kéo dài đối tượng",
-                "FILLET (F) - Bo tròn góc",
-                "CHAMFER (CHA) - Vát góc",
-                "OFFSET (O) - Tạo đối tượng song song"
-            ],
-            # Trang 4: Công cụ đo lường
-            [
-                "DISTANCE (DI) - Đo khoảng cách",
-                "AREA (AREA) - Tính diện tích",
-                "LIST (LI) - Xem thông tin đối tượng",
-                "ALIGN (AL) - Căn chỉnh đối tượng",
-                "MEASURE (ME) - Đo đạc"
-            ],
-            # Trang 5: Layer và thuộc tính
-            [
-                "LAYER (LA) - Quản lý layer",
-                "MATCHPROP (MA) - Sao chép thuộc tính",
-                "PROPERTIES (PR) - Bảng thuộc tính",
-                "COLOR (COL) - Đổi màu",
-                "LINETYPE (LT) - Đổi loại đường"
-            ],
-            # Trang 6: Text và Dimension
-            [
-                "TEXT (T) - Thêm văn bản",
-                "MTEXT (MT) - Văn bản nhiều dòng",
-                "DIMLINEAR (DLI) - Dim đường thẳng",
-                "DIMALIGNED (DAL) - Dim theo góc",
-                "DIMRADIUS (DRA) - Dim bán kính"
-            ],
-            # Trang 7: Block và Reference
-            [
-                "BLOCK (B) - Tạo block",
-                "INSERT (I) - Chèn block",
-                "XREF (XR) - Tham chiếu ngoài",
-                "EXPLODE (X) - Phá vỡ block",
-                "WBLOCK (W) - Xuất block"
-            ],
-            # Trang 8: Công cụ hỗ trợ
-            [
-                "ORTHO (F8) - Bật/tắt vẽ vuông góc",
-                "SNAP (F9) - Bật/tắt bắt điểm",
-                "GRID (F7) - Bật/tắt lưới",
-                "OSNAP (F3) - Thiết lập bắt điểm",
-                "UCS (UC) - Hệ tọa độ người dùng"
-            ]
-        ]
-        
-        # Lưu danh sách lệnh gốc và tổ chức lại theo số dòng cấu hình
-        self.commands = []
-        all_commands = []
-        for group in self.commands_source:
-            all_commands.extend(group)
-        
-        lines_per_page = self.config["lines_per_page"]
-        self.commands = [
-            all_commands[i:i + lines_per_page]
-            for i in range(0, len(all_commands), lines_per_page)
-        ]
-        
+        self.profiler.mark("config load")
+        self.usage = UsageStats(self.usage_path(), self.config["lines_per_page"]).load()
+        self.model = OverlayModel(self.config, usage=self.usage)
+        # Các bộ lệnh đã mở, giữ lại để chuyển qua lại không phải nạp lại
+        self.packs = PackCache(self.cache_dir, self.config["pack_cache_mb"] * 1024 * 1024)
+        self.pgp = None
+        self.load_catalog()
+        self.profiler.mark("catalog load")
+        
+        self.nav_queue = NavQueue()
+        if self.tracer is not None:
+            # Callback phím tắt chạy trên luồng hook của keyboard
+            self.tracer.instrument(self.nav_queue, ("push",))
+        # Phím tắt đang đăng ký: tổ hợp -> (hành động, tham số) và tổ hợp -> handle của keyboard
+        self.hotkey_table = {}
+        self.hotkey_handles = {}
+        self.prefetch_pending = None
+        # Độ trễ phím tắt -> vẽ xong, hiển thị trên HUD khi bật
+        self.latency = LatencyRecorder()
+        # Mốc bắt đầu vẽ của lần update_commands gần nhất; mẫu độ trễ chờ prefetch_pages ghi nốt
+        self.render_started = 0.0
+        self.pending_latency = None
+        self.hud_label = None
+        # Lệnh gửi từ các lần chạy sau (luồng IPC thêm vào, luồng Tk lấy ra); luồng IPC có thể
+        # đã chạy từ trước khi dựng giao diện nên hàng đợi được truyền vào từ đó
+        self.remote_commands = collections.deque() if remote_commands is None else remote_commands
+        self.command_log = None
+        # Gửi alias sang AutoCAD: tạo khi dùng lần đầu; cửa sổ nhận phím ghi lại khi chuột vào overlay
+        self.injector = None
+        self.send_target = None
+        # Theo dõi config.json và catalog bị sửa từ bên ngoài
+        self.watcher = None
+        self.changed_files = set()
+        self.reload_pending = None
         self.setup_window()
+        self.profiler.mark("window creation")
         self.setup_keyboard()
+        self.profiler.mark("hotkey registration")
         
     def load_config(self):
-        # Cấu hình mặc định
-        self.config = {
-            "prev_key": "ctrl+left",
-            "next_key": "ctrl+right",
-            "opacity": 0.95,
-            "bg_color": "#2E2E2E",
-            "text_color": "#FFFFFF",
-            "font_size": 10,
-            "lines_per_page": 5,
-            "window_position": {
-                "x": 100,
-                "y": 100
-            },
-            "window_size": {
-                "width": 350,
-                "height": 300
-            },
-            "theme": "dark"
+        # Cấu hình mặc định gộp với cấu hình đã lưu
+        self.store = ConfigStore(self.config_file)
+        self.config = self.store.load()
+    
+    def load_catalog(self):
+        # Nạp các catalog lệnh qua cache nhị phân (mmap), tự biên dịch lại khi file nguồn đổi
+        paths = self.catalog_paths()
+        self.base_catalog = self.packs.get(paths)
+        self.pack_extras = self.packs.extras(paths)
+        pgp_paths = [
+            os.path.join(self.app_dir, os.path.expandvars(path))
+            for path in self.config["pgp_files"]
+        ]
+        if not pgp_paths:
+            self.pgp = None
+            self.model.set_catalog(self.base_catalog, self.pack_extras)
+            return
+        # Alias PGP không phụ thuộc bộ lệnh: giữ bản đã phân tích khi chuyển bộ, chỉ đọc lại file đã sửa
+        if self.pgp is None or [pgp.path for pgp in self.pgp.files] != pgp_paths:
+            from helper.pgp import PgpAliases
+            self.pgp = PgpAliases(pgp_paths)
+        self.pgp.refresh()
+        self.apply_pgp_aliases()
+    
+    def catalog_paths(self):
+        # File nguồn của bộ lệnh đang chọn (hoặc "catalogs" nếu dùng bộ mặc định)
+        pack = self.config["active_pack"]
+        sources = self.config["packs"].get(pack, self.config["catalogs"]) if pack else self.config["catalogs"]
+        return [os.path.join(self.app_dir, path) for path in sources]
+    
+    def usage_path(self):
+        # Mỗi bộ lệnh có thống kê riêng vì thống kê lưu theo chỉ số lệnh
+        pack = self.config["active_pack"]
+        if not pack:
+            return os.path.join(self.app_dir, "usage.bin")
+        name = "".join(c if c.isalnum() else "_" for c in pack)
+        return os.path.join(self.app_dir, f"usage-{name}.bin")
+    
+    def select_pack(self, pack):
+        if pack == self.config["active_pack"] or (pack and pack not in self.config["packs"]):
+            return
+        self.config["active_pack"] = pack
+        self.store.request_save()
+        self.switch_pack()
+    
+    def switch_pack(self):
+        # Đổi thống kê và catalog sang bộ lệnh đang chọn; bộ đã mở gần đây lấy ngay từ cache
+        self.usage.try_flush()
+        self.usage = UsageStats(self.usage_path(), self.config["lines_per_page"]).load()
+        self.usage.attach(self.root)
+        self.model.usage = self.usage
+        self.load_catalog()
+        self.model.pages.seek(0)
+        if self.watcher is not None:
+            self.watcher.set_paths(self.watched_paths())
+        self.update_commands()
+    
+    def apply_pgp_aliases(self):
+        # Catalog có alias được giữ trong mục PackCache của bộ lệnh, dựng lại khi alias PGP đổi
+        aliased = self.pack_extras.get("aliased")
+        if aliased is None or aliased[0] is not self.pgp.by_command:
+            from helper.pgp import AliasedCatalog
+            aliased = self.pack_extras["aliased"] = (
+                self.pgp.by_command, AliasedCatalog(self.base_catalog, self.pgp.by_command))
+        self.model.set_catalog(aliased[1], self.pack_extras)
+    
+    def reload_catalog(self):
+        polling = self.pgp is not None
+        paths = self.catalog_paths()
+        # Chỉ đóng catalog cũ khi bản mới đã nạp xong; model vẫn đang trỏ vào nó
+        stale = self.packs.detach(paths)
+        try:
+            self.load_catalog()
+        except Exception as e:
+            # Ví dụ file vừa được đẩy lên còn dở: giữ bộ lệnh đang hiển thị, lần sửa sau sẽ nạp lại
+            self.packs.restore(paths, stale)
+            if stale is not None:
+                self.base_catalog, _, self.pack_extras = stale
+            print(f"AutoCAD Helper: không nạp lại được catalog: {e}", file=sys.stderr)
+            return
+        if stale is not None:
+            stale[0].close()
+        if self.pgp is not None and not polling:
+            self.root.after(PGP_POLL_MS, self.poll_pgp)
+        self.update_commands()
+    
+    def poll_pgp(self):
+        # Chỉ phân tích lại khi mtime/kích thước file PGP thay đổi
+        if self.pgp is None:
+            return
+        if self.pgp.refresh():
+            self.apply_pgp_aliases()
+            self.update_commands()
+        self.root.after(PGP_POLL_MS, self.poll_pgp)
+    
+    def setup_command_log(self):
+        # Bật/tắt/đổi file log lệnh theo cấu hình "command_log"
+        path = os.path.expandvars(self.config["command_log"])
+        following = self.command_log is not None
+        if not path:
+            self.command_log = None
+            return
+        if following and self.command_log.path == path:
+            return
+        from helper.command_log import CommandLogFollower
+        self.command_log = CommandLogFollower(path)
+        self.command_log.poll()
+        if not following:
+            self.root.after(COMMAND_LOG_POLL_MS, self.poll_command_log)
+    
+    def poll_command_log(self):
+        # Chỉ đọc phần mới ghi thêm; lệnh nhận ra cuối cùng quyết định trang hiển thị
+        if self.command_log is None:
+            return
+        for command in reversed(self.command_log.poll()):
+            if command in self.model.command_index:
+                if self.model.follow_command(command):
+                    self.update_commands()
+                break
+        self.root.after(COMMAND_LOG_POLL_MS, self.poll_command_log)
+    
+    def watched_paths(self):
+        return [self.config_file] + self.catalog_paths()
+    
+    def poll_files(self):
+        # Gom các thay đổi liên tiếp (ví dụ trình soạn thảo ghi nhiều lần) rồi mới nạp lại
+        changed = self.watcher.changed()
+        if changed:
+            self.changed_files.update(changed)
+            if self.reload_pending is not None:
+                self.root.after_cancel(self.reload_pending)
+            self.reload_pending = self.root.after(RELOAD_DEBOUNCE_MS, self.reload_changed_files)
+        self.root.after(self.watcher.interval_ms, self.poll_files)
+    
+    def reload_changed_files(self):
+        self.reload_pending = None
+        changed, self.changed_files = self.changed_files, set()
+        config_file = os.path.abspath(self.config_file)
+        reloaded = False
+        if config_file in changed:
+            changed.discard(config_file)
+            reloaded = self.reload_config()
+        if changed and not reloaded:
+            self.reload_catalog()
+    
+    def reload_config(self):
+        # Áp dụng config.json bị sửa từ bên ngoài: chỉ các trường thay đổi, qua apply_settings.
+        # Trả về True nếu catalog đã được nạp lại.
+        if self.store.written_by_self(file_signature(self.config_file)):
+            return False
+        new_config = self.store.read()
+        if new_config is None:
+            return False
+        changed = {key: value for key, value in new_config.items() if self.config.get(key) != value}
+        if not changed:
+            return False
+        geometry = {key: changed.pop(key) for key in ("window_size", "window_position") if key in changed}
+        sources = {
+            key: changed.pop(key)
+            for key in ("catalogs", "pgp_files", "command_log", "packs", "active_pack")
+            if key in changed
         }
-        
-        # Đọc cấu hình từ file nếu có
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r') as f:
-                    saved_config = json.load(f)
-                    self.config.update(saved_config)
-            except:
-                pass
+        # Gộp nguồn lệnh vào cấu hình trước: apply_settings sẽ lưu file, không được ghi lại nguồn cũ
+        self.config.update(sources)
+        if geometry:
+            self.config.update(geometry)
+            self.apply_geometry()
+        if changed:
+            self.apply_settings(changed)
+        if not sources:
+            return False
+        self.watcher.set_paths(self.watched_paths())
+        self.setup_command_log()
+        if "active_pack" in sources:
+            self.switch_pack()
+            return True
+        if "catalogs" in sources or "pgp_files" in sources or "packs" in sources:
+            self.reload_catalog()
+            return True
+        return False
     
     def save_config(self):
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=4)
+        self.store.save()
     
     def setup_window(self):
         self.root = tk.Tk()
@@ -387,75 +289,193 @@ class AutoCADHelper:
         self.root.attributes('-alpha', self.config["opacity"])
         
         # Thiết lập kích thước và vị trí cửa sổ
-        window_width = self.config["window_size"]["width"]
-        window_height = self.config["window_size"]["height"]
-        x = self.config["window_position"]["x"]
-        y = self.config["window_position"]["y"]
-        
-        self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
-        
-        # Thiết lập style
-        style = ttk.Style()
-        if self.config["theme"] == "dark":
-            # Cấu hình màu nền đen cho cửa sổ chính
-            self.root.configure(bg="#000000")
-            self.config["bg_color"] = "#000000"
-            
-            # Style cho frame và label
-            style.configure("Custom.TFrame", background="#000000")
-            style.configure(
-                "Custom.TLabel",
-                font=("Arial", self.config["font_size"]),
-                background="#000000",
-                foreground=self.config["text_color"]
-            )
-            style.configure(
-                "Custom.TButton",
-                background="#000000",
-                foreground=self.config["text_color"]
-            )
-        else:
-            style.configure(
-                "Custom.TLabel",
-                font=("Arial", self.config["font_size"])
-            )
-            style.configure(
-                "Custom.TButton",
-                background="#000000",
-                foreground="#FFFFFF"
-            )
+        self.apply_geometry()
+        self.store.attach(self.root)
+        self.usage.attach(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
+        
+        # Thiết lập style: theme được biên dịch thành bộ style có tên riêng
+        load_theme_files(os.path.join(self.app_dir, "themes"))
+        self.fonts = create_fonts(self.root, self.config)
+        self.theme_compiler = ThemeCompiler(ttk.Style())
+        palette = self.theme_compiler.compile(self.config)
+        self.root.configure(bg=palette["background"])
+        self.config["bg_color"] = palette["background"]
         
         # Main frame
-        self.main_frame = ttk.Frame(self.root, style="Custom.TFrame")
+        self.main_frame = ttk.Frame(self.root, style=style_name(self.config, "Custom.TFrame"))
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Label hiển thị số trang
         self.page_label = ttk.Label(
             self.main_frame,
-            style="Custom.TLabel",
-            font=("Arial", self.config["font_size"], "bold")
+            style=style_name(self.config, "Custom.Title.TLabel")
         )
         self.page_label.pack(pady=(0, 10))
         
         # Frame chứa danh sách lệnh
-        self.commands_frame = ttk.Frame(self.main_frame, style="Custom.TFrame")
+        self.commands_frame = ttk.Frame(self.main_frame, style=style_name(self.config, "Custom.TFrame"))
         self.commands_frame.pack(fill=tk.BOTH, expand=True)
+        self.commands_frame.bind('<Configure>', self.on_commands_configure)
+        self.rows = make_row_renderer(self.commands_frame, self.config, self.on_row_click)
+        
+        # Widget cần đổi style khi đổi theme, kèm tên style gốc
+        self.themed_widgets = [
+            (self.main_frame, "Custom.TFrame"),
+            (self.page_label, "Custom.Title.TLabel"),
+            (self.commands_frame, "Custom.TFrame"),
+        ]
+        
+        # Ô tìm kiếm, chỉ hiện khi bật chế độ tìm kiếm
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(self.main_frame, textvariable=self.search_var)
+        self.search_var.trace_add("write", self.on_search_change)
+        self.search_entry.bind('<Escape>', self.close_search)
+        self.search_entry.bind('<Return>', self.pick_search_result)
+        self.root.bind('<Control-f>', self.open_search)
         
         # Bind chuột phải để hiện menu
         self.root.bind('<Button-3>', self.show_context_menu)
         
         # Bind sự kiện thay đổi kích thước cửa sổ
         self.root.bind('<Configure>', self.on_window_configure)
+        self.root.bind('<Enter>', self.on_pointer_enter)
     
     def setup_keyboard(self):
+        # Nạp keyboard khi cần để cửa sổ hiện ra sớm hơn
+        import keyboard
+        
+        # Chỉ gỡ/đăng ký lại những phím thay đổi so với lần trước
+        table = compile_hotkeys(self.config)
+        removed, added = diff_hotkeys(self.hotkey_table, table)
+        for hotkey in removed:
+            handle = self.hotkey_handles.pop(hotkey, None)
+            self.hotkey_table.pop(hotkey, None)
+            if handle is not None:
+                try:
+                    keyboard.remove_hotkey(handle)
+                except (KeyError, ValueError):
+                    pass
+        
+        # Callback chạy trên luồng hook của keyboard: chỉ đẩy vào hàng đợi
+        for hotkey, (action, arg) in added.items():
+            callback = self.queue_remote if action in QUEUED_ACTIONS else self.nav_queue.push
+            try:
+                self.hotkey_handles[hotkey] = keyboard.add_hotkey(
+                    hotkey, callback, args=(action, arg)
+                )
+            except ValueError:
+                # Tổ hợp phím không hợp lệ: bỏ qua, lần sau sẽ thử lại
+                continue
+            self.hotkey_table[hotkey] = (action, arg)
+    
+    def process_nav_queue(self):
+        # Chạy trên luồng Tk: gộp các phím bấm dồn dập thành một lần vẽ
+        target, delta, search, fired_at, count = self.nav_queue.drain()
+        if target is not None or delta:
+            dequeued = time.perf_counter()
+            if self.jump_page(target, delta):
+                rendered = time.perf_counter()
+                # update_commands đã hẹn prefetch_pages chạy ở lần rảnh kế tiếp, sau khi vẽ xong
+                self.pending_latency = (fired_at, dequeued, self.render_started, rendered, count)
+        if search:
+            self.open_search()
+        while self.remote_commands:
+            self.run_remote_command(*self.remote_commands.popleft())
+        self.root.after(NAV_TICK_MS, self.process_nav_queue)
+    
+    def apply_geometry(self):
+        window_width = self.config["window_size"]["width"]
+        window_height = self.config["window_size"]["height"]
+        x = self.config["window_position"]["x"]
+        y = self.config["window_position"]["y"]
+        self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
+    
+    def queue_remote(self, action, arg=None):
+        # Gọi từ luồng IPC hoặc luồng hook: luồng Tk sẽ chạy lệnh ở nhịp kế tiếp
+        self.remote_commands.append((action, arg))
+    
+    def run_remote_command(self, action, arg):
+        # Lệnh từ lần chạy sau hoặc phím tắt: show, page <n>, search <từ khóa>, reload, pack <tên>
+        if action == "show":
+            self.root.deiconify()
+            self.root.lift()
+        elif action == "page":
+            self.jump_page(arg - 1, 0)
+        elif action == "search":
+            self.open_search()
+            if arg is not None:
+                self.search_var.set(arg)
+        elif action == "reload":
+            self.reload_catalog()
+        elif action == "pack":
+            self.select_pack(arg)
+        elif action == "row":
+            # Phím tắt không lấy focus nên gửi thẳng tới cửa sổ đang làm việc
+            self.send_row(arg - 1, None)
+    
+    def toggle_hud(self):
+        if self.hud_label is not None:
+            self.hud_label.destroy()
+            self.hud_label = None
+            return
+        self.hud_label = ttk.Label(
+            self.main_frame,
+            style=style_name(self.config, "Custom.TLabel"),
+            font=("Consolas", 8),
+            justify=tk.LEFT
+        )
+        self.hud_label.pack(before=self.commands_frame, side=tk.BOTTOM, anchor=tk.W, pady=(5, 0))
+        self.hud_last = (time.perf_counter(), self.latency.events_total, self.latency.renders_total)
+        self.refresh_hud()
+    
+    def refresh_hud(self):
+        if self.hud_label is None:
+            return
+        now = time.perf_counter()
+        last_time, last_events, last_renders = self.hud_last
+        elapsed = max(now - last_time, 1e-6)
+        events_rate = (self.latency.events_total - last_events) / elapsed
+        renders_rate = (self.latency.renders_total - last_renders) / elapsed
+        self.hud_last = (now, self.latency.events_total, self.latency.renders_total)
+        summary = self.latency.summary()
+        lines = [f"{name:<8} p50 {p50:6.2f}  p95 {p95:6.2f}  p99 {p99:6.2f} ms"
+                 for name, (p50, p95, p99) in summary.items()]
+        lines.append(f"phím {events_rate:5.1f}/s  vẽ {renders_rate:5.1f}/s  "
+                     f"ghi cấu hình {self.store.writes_performed}/{self.store.writes_requested}")
+        self.hud_label.configure(text="\n".join(lines))
+        self.root.after(HUD_REFRESH_MS, self.refresh_hud)
+    
+    def export_latency(self):
+        from tkinter import messagebox
+        path = os.path.join(self.app_dir, time.strftime("latency-%Y%m%d-%H%M%S.jsonl"))
         try:
-            keyboard.remove_hotkey(self.config["prev_key"])
-            keyboard.remove_hotkey(self.config["next_key"])
-        except:
-            pass
-        
-        keyboard.add_hotkey(self.config["prev_key"], self.prev_page)
-        keyboard.add_hotkey(self.config["next_key"], self.next_page)
+            self.latency.export_jsonl(path)
+            messagebox.showinfo("Thông báo", f"Đã xuất {len(self.latency)} mẫu ra {path}")
+        except OSError as e:
+            messagebox.showerror("Lỗi", f"Không thể xuất số liệu: {str(e)}")
+    
+    def take_memory_snapshot(self):
+        from tkinter import messagebox
+        path = os.path.join(self.app_dir, time.strftime("trace-mem-%Y%m%d-%H%M%S.txt"))
+        try:
+            self.tracer.take_snapshot(path)
+            messagebox.showinfo("Thông báo", f"Đã ghi thống kê bộ nhớ ra {path}")
+        except OSError as e:
+            messagebox.showerror("Lỗi", f"Không thể ghi thống kê bộ nhớ: {str(e)}")
+    
+    def export_trace(self, notify=True):
+        path = os.path.join(self.app_dir, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        try:
+            self.tracer.export(path)
+        except OSError as e:
+            if notify:
+                from tkinter import messagebox
+                messagebox.showerror("Lỗi", f"Không thể ghi file trace: {str(e)}")
+            return
+        if notify:
+            from tkinter import messagebox
+            messagebox.showinfo("Thông báo", f"Đã ghi {len(self.tracer.events)} sự kiện ra {path}")
     
     def show_context_menu(self, event):
         menu = tk.Menu(self.root, tearoff=0)
@@ -463,46 +483,128 @@ class AutoCADHelper:
             label="Tự động khởi động ✓" if os.path.exists(self.startup_path) else "Tự động khởi động",
             command=self.toggle_startup
         )
+        menu.add_command(label="Tìm kiếm...", command=self.open_search)
+        menu.add_command(
+            label="Lệnh hay dùng ✓" if self.model.showing_hot else "Lệnh hay dùng",
+            command=self.toggle_hot_page
+        )
+        if self.config["packs"]:
+            packs_menu = tk.Menu(menu, tearoff=0)
+            for pack in [""] + list(self.config["packs"]):
+                label = pack or "Mặc định"
+                packs_menu.add_command(
+                    label=label + " ✓" if pack == self.config["active_pack"] else label,
+                    command=lambda p=pack: self.select_pack(p)
+                )
+            menu.add_cascade(label="Bộ lệnh", menu=packs_menu)
         menu.add_command(label="Cài đặt...", command=self.show_settings)
         menu.add_separator()
-        menu.add_command(label="Thoát", command=self.root.quit)
+        menu.add_command(
+            label="Hiệu năng (HUD) ✓" if self.hud_label is not None else "Hiệu năng (HUD)",
+            command=self.toggle_hud
+        )
+        menu.add_command(label="Xuất số liệu độ trễ", command=self.export_latency)
+        if self.tracer is not None:
+            menu.add_command(label="Chụp bộ nhớ (tracemalloc)", command=self.take_memory_snapshot)
+            menu.add_command(label="Ghi file trace", command=self.export_trace)
+        menu.add_separator()
+        menu.add_command(label="Thoát", command=self.quit)
         menu.tk_popup(event.x_root, event.y_root)
         
+    def open_search(self, event=None):
+        if not self.model.searching:
+            self.model.start_search()
+            self.search_entry.pack(before=self.commands_frame, fill=tk.X, pady=(0, 5))
+        self.search_entry.focus_force()
+        self.search_entry.select_range(0, tk.END)
+    
+    def close_search(self, event=None):
+        if not self.model.searching:
+            return
+        self.model.stop_search()
+        self.search_entry.pack_forget()
+        self.search_var.set("")
+        self.update_commands()
+    
+    def pick_search_result(self, event=None):
+        # Chọn kết quả đầu trang: ghi nhận lần dùng rồi về catalog tại lệnh đó
+        entry = self.model.entry_index(0)
+        self.close_search()
+        if entry is not None:
+            self.model.record_use(entry)
+            self.model.pages.seek(entry)
+            self.update_commands()
+    
+    def on_row_click(self, row):
+        if self.config["send_on_click"]:
+            self.send_row(row, self.send_target)
+            return
+        entry = self.model.entry_index(row)
+        if entry is not None:
+            self.model.record_use(entry)
+            if self.model.showing_hot:
+                self.update_commands()
+    
+    def on_pointer_enter(self, event):
+        # Chuột vừa vào overlay, trước khi bấm: cửa sổ đang có focus là nơi cần gửi phím tới
+        if event.widget is self.root and self.config["send_on_click"]:
+            from helper.injector import foreground_window
+            window = foreground_window()
+            if window is not None and window != int(self.root.wm_frame(), 16):
+                self.send_target = window
+    
+    def send_row(self, row, window):
+        # Đưa alias (hoặc tên lệnh) của dòng vào hàng đợi gửi phím; không chờ việc gõ
+        entry = self.model.entry_index(row)
+        if entry is None:
+            return
+        catalog = self.model.catalog
+        text = catalog.alias(entry).split(",")[0].strip() or catalog.name(entry)
+        if self.injector is None:
+            from helper.injector import CommandInjector, KeyboardBackend
+            self.injector = CommandInjector(KeyboardBackend(), self.config)
+        self.injector.submit(text, window)
+        self.model.record_use(entry)
+        if self.model.showing_hot:
+            self.update_commands()
+    
+    def toggle_hot_page(self):
+        if self.model.searching:
+            self.close_search()
+        self.model.show_hot(not self.model.showing_hot)
+        self.update_commands()
+    
+    def on_search_change(self, *args):
+        if self.model.searching:
+            self.model.set_query(self.search_var.get())
+            self.update_commands()
+    
     def show_settings(self):
-        dialog = SettingsDialog(self.root, self.config, self.apply_settings)
+        from helper.dialogs import MAX_LINES_PER_PAGE, SettingsDialog
+        # Xem trước bằng chính các lệnh quanh trang hiện tại
+        sample = self.model.sample(max(MAX_LINES_PER_PAGE.values()))
+        dialog = SettingsDialog(self.root, self.config, self.apply_settings, self.theme_compiler, sample)
         self.root.wait_window(dialog.dialog)
     
     def apply_settings(self, new_config):
         # Lưu cấu hình mới
+        renderer = (self.config["renderer"], self.config["page_buffers"])
         self.config.update(new_config)
         self.save_config()
+        if self.config["auto_fit_lines"]:
+            self.config["lines_per_page"] = fit_lines(self.root, self.config, self.commands_frame.winfo_height())
         
-        # Áp dụng theme
-        style = ttk.Style()
-        if self.config["theme"] == "dark":
-            self.root.configure(bg="#000000")
-            self.config["bg_color"] = "#000000"
-            
-            # Style cho frame và label
-            style.configure("Custom.TFrame", background="#000000")
-            style.configure(
-                "Custom.TLabel",
-                font=("Arial", self.config["font_size"]),
-                background="#000000",
-                foreground=self.config["text_color"]
-            )
-        else:
-            self.root.configure(bg="SystemButtonFace")
-            style.configure(
-                "Custom.TLabel",
-                font=("Arial", self.config["font_size"]),
-                background="SystemButtonFace",
-                foreground="SystemWindowText"
-            )
-            style.configure("Custom.TFrame", background="SystemButtonFace")
+        # Áp dụng theme: biên dịch (nếu chưa) rồi trỏ các widget sang bộ style mới
+        self.apply_theme()
         
         # Tổ chức lại lệnh theo số dòng mới
         self.reorganize_commands()
+        if renderer != (self.config["renderer"], self.config["page_buffers"]):
+            self.rows.destroy()
+            self.rows = make_row_renderer(self.commands_frame, self.config, self.on_row_click)
+        else:
+            self.rows.resize(self.config["lines_per_page"])
+            self.rows.restyle()
         
         # Áp dụng độ trong suốt
         self.root.attributes('-alpha', self.config["opacity"])
@@ -513,7 +615,18 @@ class AutoCADHelper:
         # Cập nhật hiển thị
         self.update_commands()
     
+    def apply_theme(self):
+        palette = self.theme_compiler.compile(self.config)
+        set_font_size(self.config["font_size"])
+        self.root.configure(bg=palette["background"])
+        self.config["bg_color"] = palette["background"]
+        for widget, base in self.themed_widgets:
+            widget.configure(style=style_name(self.config, base))
+        if self.hud_label is not None:
+            self.hud_label.configure(style=style_name(self.config, "Custom.TLabel"))
+    
     def toggle_startup(self):
+        from tkinter import messagebox
         if os.path.exists(self.startup_path):
             os.remove(self.startup_path)
             messagebox.showinfo("Thông báo", "Đã tắt tự động khởi động")
@@ -532,71 +645,175 @@ class AutoCADHelper:
     
     def on_window_configure(self, event=None):
         if event and event.widget == self.root:
-            # Lưu kích thước mới
-            self.config["window_size"] = {
+            size = {
                 "width": self.root.winfo_width(),
                 "height": self.root.winfo_height()
             }
-            # Lưu vị trí mới
-            self.config["window_position"] = {
+            position = {
                 "x": self.root.winfo_x(),
                 "y": self.root.winfo_y()
             }
-            self.save_config()
+            if size == self.config["window_size"] and position == self.config["window_position"]:
+                return
+            # Cập nhật trong bộ nhớ, chỉ ghi file khi đã ngừng kéo/thay đổi kích thước
+            self.config["window_size"] = size
+            self.config["window_position"] = position
+            self.store.request_save()
+    
+    def on_commands_configure(self, event):
+        # Chế độ tự khớp: chỉ phân trang lại khi số dòng vừa khung thực sự thay đổi
+        if not self.config["auto_fit_lines"]:
+            return
+        lines = fit_lines(self.root, self.config, event.height)
+        if lines == self.config["lines_per_page"]:
+            return
+        self.config["lines_per_page"] = lines
+        self.reorganize_commands()
+        self.rows.resize(lines)
+        self.update_commands()
     
     def reorganize_commands(self):
-        # Tổ chức lại danh sách lệnh dựa trên số dòng mỗi trang
-        lines_per_page = self.config["lines_per_page"]
-        all_commands = []
-        for group in self.commands:
-            all_commands.extend(group)
-        
-        # Chia thành các nhóm mới theo số dòng mỗi trang
-        self.commands = [
-            all_commands[i:i + lines_per_page]
-            for i in range(0, len(all_commands), lines_per_page)
-        ]
-        
-        # Đảm bảo trang hiện tại hợp lệ
-        if self.current_page >= len(self.commands):
-            self.current_page = len(self.commands) - 1
+        # Chỉ đổi số dòng mỗi trang; trang được tính khi cần, vẫn giữ lệnh đang xem
+        self.model.apply_lines_per_page()
     
     def update_commands(self):
-        # Xóa tất cả widgets cũ trong commands_frame
-        for widget in self.commands_frame.winfo_children():
-            widget.destroy()
-            
-        # Hiển thị các lệnh của trang hiện tại
-        for cmd in self.commands[self.current_page]:
-            label = ttk.Label(
-                self.commands_frame,
-                text=cmd,
-                style="Custom.TLabel"
-            )
-            label.pack(anchor=tk.W, pady=2)
-            
-            # Thêm hiệu ứng hover nếu đang ở theme tối
-            if self.config["theme"] == "dark":
-                label.bind('<Enter>', lambda e, l=label: l.configure(foreground="#00FF00"))
-                label.bind('<Leave>', lambda e, l=label: l.configure(foreground=self.config["text_color"]))
+        # Hiển thị các lệnh của trang hiện tại trên các dòng có sẵn
+        self.render_started = time.perf_counter()
+        self.rows.render(self.model.rows())
         
         # Cập nhật label số trang
-        self.page_label.config(text=f"Trang {self.current_page + 1}/{len(self.commands)}")
+        self.page_label.config(text=self.model.page_label())
+        
+        # Vẽ trước trang kề khi rảnh; hẹn lại để luôn chạy sau phần vẽ lại của lần render này
+        if self.prefetch_pending is not None:
+            self.root.after_cancel(self.prefetch_pending)
+        self.prefetch_pending = self.root.after_idle(self.prefetch_pages)
     
-    def prev_page(self):
-        if self.current_page > 0:
-            self.current_page -= 1
+    def prefetch_pages(self):
+        # Lần rảnh đầu tiên sau khi vẽ: mốc "idle" của mẫu độ trễ lấy trước khi vẽ trước trang kề
+        idle = time.perf_counter()
+        self.prefetch_pending = None
+        pages = self.model.pages
+        for page in (pages.page + 1, pages.page - 1):
+            if 0 <= page < pages.page_count:
+                self.rows.prepare(pages.rows(page))
+        if self.pending_latency is not None:
+            fired_at, dequeued, render_start, rendered, count = self.pending_latency
+            self.pending_latency = None
+            self.latency.record(fired_at, dequeued, render_start, rendered, idle, time.perf_counter(), count)
+    
+    def move_page(self, delta):
+        if self.model.move(delta):
             self.update_commands()
     
-    def next_page(self):
-        if self.current_page < len(self.commands) - 1:
-            self.current_page += 1
+    def jump_page(self, target, delta=0):
+        # Nhảy tới trang target (LAST_PAGE là trang cuối) rồi dời thêm delta, vẽ một lần
+        pages = self.model.pages
+        page = pages.page if target is None else target
+        if page == LAST_PAGE:
+            page = pages.page_count - 1
+        if pages.goto_page(page + delta):
             self.update_commands()
+            return True
+        return False
+    
+    def prev_page(self):
+        self.move_page(-1)
+    
+    def next_page(self):
+        self.move_page(1)
+    
+    def quit(self):
+        # Ghi nốt cấu hình và thống kê đang chờ trước khi đóng cửa sổ; ghi lỗi (ổ mạng mất kết nối,
+        # file bị khóa) không được chặn việc thoát
+        self.store.try_flush()
+        self.usage.try_flush()
+        if self.guard is not None:
+            self.guard.close()
+        if self.watcher is not None:
+            self.watcher.close()
+        if self.tracer is not None:
+            self.export_trace(notify=False)
+        if self.injector is not None:
+            self.injector.close()
+        self.root.destroy()
     
     def run(self):
         self.update_commands()
-        self.root.mainloop()
+        self.root.update_idletasks()
+        self.profiler.mark("first paint")
+        if self.profiler.enabled:
+            print(self.profiler.report(), flush=True)
+        self.root.after(NAV_TICK_MS, self.process_nav_queue)
+        if self.pgp is not None:
+            self.root.after(PGP_POLL_MS, self.poll_pgp)
+        self.setup_command_log()
+        self.watcher = create_watcher(self.watched_paths())
+        self.root.after(self.watcher.interval_ms, self.poll_files)
+        # Sau lần vẽ đầu tiên: dựng chỉ mục tìm kiếm trên luồng nền, Ctrl+F không phải chờ
+        self.root.after_idle(self.model.build_search_index)
+        if self.config["warm_packs"] and self.config["packs"]:
+            # Sau lần vẽ đầu tiên: biên dịch trước cache của các bộ lệnh trên luồng nền
+            sources = [
+                [os.path.join(self.app_dir, path) for path in paths]
+                for paths in self.config["packs"].values()
+            ]
+            self.root.after_idle(self.packs.warm, sources)
+        try:
+            self.root.mainloop()
+        finally:
+            self.store.try_flush()
+            self.usage.try_flush()
+
+def parse_args(argv):
+    import argparse
+    
+    def number(value):
+        result = positive_int(value)
+        if result is None:
+            raise argparse.ArgumentTypeError(f"phải là số nguyên dương: {value!r}")
+        return result
+    
+    parser = argparse.ArgumentParser(description="AutoCAD Helper")
+    parser.add_argument("--profile-startup", action="store_true", help="in thời gian từng bước khởi động")
+    parser.add_argument("--trace", action="store_true", help="ghi trace (Chrome trace JSON); giữ Shift khi khởi động cũng bật")
+    parser.add_argument("--show", action="store_true", help="đưa overlay đang chạy lên trên")
+    parser.add_argument("--page", type=number, help="nhảy tới trang (bắt đầu từ 1)")
+    parser.add_argument("--search", help="mở ô tìm kiếm với từ khóa")
+    parser.add_argument("--reload", action="store_true", help="nạp lại catalog lệnh")
+    parser.add_argument("--pack", help="chọn bộ lệnh (chuỗi rỗng là bộ mặc định)")
+    parser.add_argument("--row", type=number, help="gửi lệnh ở dòng N của trang hiện tại sang AutoCAD")
+    args = parser.parse_args(argv)
+    commands = []
+    if args.show:
+        commands.append(("show", None))
+    if args.reload:
+        commands.append(("reload", None))
+    if args.page is not None:
+        commands.append(("page", args.page))
+    if args.pack is not None:
+        commands.append(("pack", args.pack))
+    if args.search is not None:
+        commands.append(("search", args.search))
+    if args.row is not None:
+        commands.append(("row", args.row))
+    return args, commands
 
 if __name__ == "__main__":
-    app = AutoCADHelper()
+    args, commands = parse_args(sys.argv[1:])
+    # Đã có overlay đang chạy: chuyển lệnh sang đó rồi thoát, không cài thêm hook bàn phím
+    guard = InstanceGuard()
+    claimed = guard.claim(commands or [("show", None)])
+    if not claimed:
+        if claimed is None:
+            print("AutoCAD Helper: phiên bản đang chạy không trả lời", file=sys.stderr)
+        sys.exit(0 if claimed is False else 1)
+    # Nghe lệnh ngay khi giữ khóa; lệnh đến trong lúc khởi động chờ trong hàng đợi tới khi Tk sẵn sàng
+    remote_commands = collections.deque(commands)
+    guard.start(lambda action, arg: remote_commands.append((action, arg)))
+    profiler = StartupProfiler(STARTUP_T0, enabled=args.profile_startup)
+    profiler.mark("imports")
+    from helper.tracing import Tracer, modifier_held
+    tracer = Tracer() if args.trace or modifier_held() else None
+    app = AutoCADHelper(profiler, guard, tracer, remote_commands)
     app.run()